@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import verify_dashboard_password
+from app.db import get_db
+from app.schemas import AnalyticsResponse
+from app.services.analytics import bucket_start, sales_summary
+from app.utils.formatting import now_utc
+
+router = APIRouter()
+
+
+@router.get("/api/analytics", response_model=AnalyticsResponse)
+def analytics(
+    period: str = Query(default="hour", pattern="^(hour|day)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    tenant_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _: None = Depends(verify_dashboard_password),
+) -> AnalyticsResponse:
+    return sales_summary(db, period, since or bucket_start(now_utc(), "day"), until, tenant_id)
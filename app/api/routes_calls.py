@@ -1,47 +1,78 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
-from typing import Optional
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Form
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.db import get_db
-from app.models import CallSession, Order
+from app.db import group_committer
+from app.models import Order
 from app.schemas import Order as OrderSchema
+from app.services.analytics import record_order
 from app.services.llm_order_extractor import ExtractionResult, extract_or_question
-from app.services.menu import price_items
-from app.services.printer_escpos import print_order
-from app.services.telephony_twilio import dial_fallback, gather_speech, say_and_hangup
+from app.services.menu import MenuIndex
+from app.services.order_events import order_events
+from app.services.order_items import add_order_items
+from app.services.pricing import price_table
+from app.services.print_outbox import add_print_job, print_worker
+from app.services.session_store import LiveSession, session_store
+from app.services.tenants import tenant_registry
+from app.services.telephony_twilio import (
+    FIXED_PROMPTS,
+    connect_stream,
+    dial_fallback,
+    gather_speech,
+    say_and_hangup,
+)
 from app.utils.formatting import format_order_summary, now_utc
+from app.utils.metrics import CLARIFICATIONS, FALLBACKS, timed
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+NOT_CAUGHT = "Sorry, I did not catch that. What would you like?"
+MENU_UNAVAILABLE = "Sorry, we cannot take orders right now."
+CLARIFY = "Could you clarify your order?"
+SAY_YES_OR_NO = "Please say yes or no."
+ORDER_NOT_FOUND = "Sorry, I could not find your order. Please call again."
+ORDER_PLACED = "Great! Your order is placed. Thank you!"
+REPEAT_ORDER = "Okay, please tell me the order again."
+
+
+def greeting(restaurant_name: Optional[str] = None) -> str:
+    return f"Hello! Thanks for calling {restaurant_name or settings.restaurant_name}. I can take your order."
+
+
+def fixed_prompts() -> List[str]:
+    return [
+        *(greeting(tenant.name) for tenant in tenant_registry.tenants()),
+        NOT_CAUGHT,
+        MENU_UNAVAILABLE,
+        CLARIFY,
+        SAY_YES_OR_NO,
+        ORDER_NOT_FOUND,
+        ORDER_PLACED,
+        REPEAT_ORDER,
+        *FIXED_PROMPTS,
+    ]
+
 
 def _action_url(path: str) -> str:
     return f"{settings.base_url.rstrip('/')}{path}"
 
 
-def _get_or_create_session(db: Session, session_id: str, caller_phone: Optional[str]) -> CallSession:
-    session = db.query(CallSession).filter(CallSession.id == session_id).first()
-    if session:
-        if caller_phone and not session.caller_phone:
-            session.caller_phone = caller_phone
-            db.add(session)
-            db.commit()
-        return session
-    session = CallSession(id=session_id, caller_phone=caller_phone or "")
-    db.add(session)
-    db.commit()
-    return session
+def _stream_url(path: str) -> str:
+    return _action_url(path).replace("http", "ws", 1)
 
 
-def _append_transcript(session: CallSession, text: str) -> None:
+def _append_transcript(session: LiveSession, text: str) -> None:
     if not text:
         return
     combined = f"{session.transcript} {text}".strip()
@@ -53,12 +84,14 @@ def _build_order(
     caller_phone: str,
     transcript: str,
     status: str,
-    menu: dict,
+    menu_index: MenuIndex,
+    tenant_id: Optional[str] = None,
 ) -> OrderSchema:
     timestamp = now_utc()
     order_id = str(uuid.uuid4())
     items = order_state.get("items", [])
-    totals = price_items(items, menu=menu)
+    with timed("pricing"):
+        totals = price_table(menu_index).price(items).as_dict()
     return OrderSchema(
         order_id=order_id,
         timestamp=timestamp,
@@ -72,6 +105,7 @@ def _build_order(
         status=status,
         raw_transcript=transcript,
         confidence_notes=order_state.get("confidence_notes"),
+        tenant_id=tenant_id,
     )
 
 
@@ -89,72 +123,73 @@ def _save_order(db: Session, order: OrderSchema) -> Order:
         status=order.status,
         raw_transcript=order.raw_transcript,
         confidence_notes=order.confidence_notes,
+        tenant_id=order.tenant_id,
     )
     db.add(model)
-    db.commit()
-    db.refresh(model)
+    add_order_items(db, model)
+    add_print_job(db, order)
+    record_order(db, model)
     return model
 
 
-def _should_fallback(result: ExtractionResult, session: CallSession) -> bool:
+def _should_fallback(result: ExtractionResult, session: LiveSession) -> bool:
     if result.error:
         session.llm_failures += 1
     return session.llm_failures >= settings.llm_max_retries
 
 
-@router.post("/twilio/voice")
-def twilio_voice(
-    CallSid: str = Form(...),
-    From: Optional[str] = Form(default=None),
-    db: Session = Depends(get_db),
-) -> Response:
-    _get_or_create_session(db, CallSid, From)
-    greeting = (
-        f"Hello! Thanks for calling {settings.restaurant_name}. "
-        "I can take your order."
-    )
-    twiml = gather_speech(_action_url("/twilio/process"), greeting)
+@dataclass
+class Turn:
+    action: str
+    prompt: str = ""
+    cacheable: bool = True
+
+
+def turn_twiml(turn: Turn) -> str:
+    if turn.action == "process":
+        return gather_speech(_action_url("/twilio/process"), turn.prompt, turn.cacheable)
+    if turn.action == "confirm":
+        return gather_speech(_action_url("/twilio/confirm"), turn.prompt, turn.cacheable)
+    if turn.action == "fallback":
+        return dial_fallback(settings.fallback_forward_number)
+    return say_and_hangup(turn.prompt)
+
+
+def _twiml_response(twiml: str) -> Response:
     return Response(content=twiml, media_type="application/xml")
 
 
-@router.post("/twilio/process")
-def twilio_process(
-    CallSid: str = Form(...),
-    From: Optional[str] = Form(default=None),
-    SpeechResult: Optional[str] = Form(default=None),
-    Confidence: Optional[str] = Form(default=None),
-    db: Session = Depends(get_db),
-    request: Request,
-) -> Response:
-    session = _get_or_create_session(db, CallSid, From)
+async def process_speech(
+    session: LiveSession,
+    speech: Optional[str],
+    menu_index: Optional[MenuIndex],
+    caller_phone: Optional[str] = None,
+    confidence: Optional[str] = None,
+) -> Turn:
     session.attempts += 1
 
-    if not SpeechResult:
-        db.add(session)
-        db.commit()
-        twiml = gather_speech(_action_url("/twilio/process"), "Sorry, I did not catch that. What would you like?")
-        return Response(content=twiml, media_type="application/xml")
+    if not speech:
+        session_store.save(session)
+        return Turn("process", NOT_CAUGHT)
 
-    _append_transcript(session, SpeechResult)
+    _append_transcript(session, speech)
 
-    menu = request.app.state.menu
-    if menu is None:
+    if menu_index is None:
         logger.error("Menu not loaded")
-        twiml = say_and_hangup("Sorry, we cannot take orders right now.")
-        return Response(content=twiml, media_type="application/xml")
+        return Turn("hangup", MENU_UNAVAILABLE)
 
     order_state = session.order_state or {}
-    if Confidence:
-        order_state["confidence_notes"] = f"Confidence: {Confidence}"
+    if confidence:
+        order_state["confidence_notes"] = f"Confidence: {confidence}"
 
-    result = extract_or_question(SpeechResult, menu, order_state)
+    with timed("extract"):
+        result = await extract_or_question(speech, menu_index, order_state)
 
     if _should_fallback(result, session):
+        FALLBACKS.inc()
         session.status = "fallback"
-        db.add(session)
-        db.commit()
-        twiml = dial_fallback(settings.fallback_forward_number)
-        return Response(content=twiml, media_type="application/xml")
+        session_store.finish(session)
+        return Turn("fallback")
 
     existing_notes = order_state.get("confidence_notes")
     if existing_notes and "confidence_notes" not in result.order:
@@ -166,70 +201,119 @@ def twilio_process(
         result.order["confidence_notes"] = combined
 
     session.order_state = result.order
-    db.add(session)
-    db.commit()
+    session_store.save(session)
 
     if result.missing_fields:
-        question = result.question or "Could you clarify your order?"
-        twiml = gather_speech(_action_url("/twilio/process"), question)
-        return Response(content=twiml, media_type="application/xml")
+        CLARIFICATIONS.inc()
+        return Turn("process", result.question or CLARIFY, cacheable=result.question_cacheable)
 
     draft_order = _build_order(
         session.order_state,
-        session.caller_phone or From or "",
+        session.caller_phone or caller_phone or "",
         session.transcript,
         "received",
-        menu,
+        menu_index,
+        session.tenant_id,
     )
     summary = format_order_summary(draft_order)
-    confirmation = f"You ordered {summary}. Is that correct?"
-    twiml = gather_speech(_action_url("/twilio/confirm"), confirmation)
-    return Response(content=twiml, media_type="application/xml")
+    return Turn("confirm", f"You ordered {summary}. Is that correct?", cacheable=False)
 
 
-@router.post("/twilio/confirm")
-def twilio_confirm(
-    CallSid: str = Form(...),
-    From: Optional[str] = Form(default=None),
-    SpeechResult: Optional[str] = Form(default=None),
-    db: Session = Depends(get_db),
-    request: Request,
-) -> Response:
-    session = _get_or_create_session(db, CallSid, From)
-
-    response = (SpeechResult or "").lower()
+def confirm_speech(
+    session: LiveSession,
+    speech: Optional[str],
+    menu_index: Optional[MenuIndex],
+    caller_phone: Optional[str] = None,
+) -> Turn:
+    response = (speech or "").lower()
     if not response:
-        twiml = gather_speech(_action_url("/twilio/confirm"), "Please say yes or no.")
-        return Response(content=twiml, media_type="application/xml")
+        return Turn("confirm", SAY_YES_OR_NO)
     if any(word in response for word in ["yes", "correct", "right", "yeah", "yep"]):
         if not session.order_state:
-            twiml = say_and_hangup("Sorry, I could not find your order. Please call again.")
-            return Response(content=twiml, media_type="application/xml")
+            return Turn("hangup", ORDER_NOT_FOUND)
+        if menu_index is None:
+            logger.error("Menu not loaded")
+            return Turn("hangup", MENU_UNAVAILABLE)
 
-        menu = request.app.state.menu
         draft = _build_order(
             session.order_state,
-            session.caller_phone or From or "",
+            session.caller_phone or caller_phone or "",
             session.transcript,
             "confirmed",
-            menu,
+            menu_index,
+            session.tenant_id,
         )
-        saved = _save_order(db, draft)
-
-        try:
-            print_order(draft)
-            saved.status = "printed"
-            db.add(saved)
-            db.commit()
-        except Exception as exc:
-            logger.error("Printing failed: %s", exc)
+        with timed("save_order"):
+            saved = group_committer.run(lambda db: _save_order(db, draft))
+        print_worker.wake()
+        order_events.publish_order(saved)
 
         session.status = "completed"
-        db.add(session)
-        db.commit()
+        session_store.finish(session)
+        return Turn("hangup", ORDER_PLACED)
+
+    if session.order_state:
+        session.order_state = {**session.order_state, "items": []}
+        session_store.save(session)
+    return Turn("process", REPEAT_ORDER)
+
+
+def call_context(
+    call_sid: str,
+    caller_phone: Optional[str],
+    to_number: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> Tuple[LiveSession, Optional[MenuIndex]]:
+    if to_number and not tenant_id:
+        tenant_id = tenant_registry.resolve(to_number).id
+    session = session_store.get_or_create(call_sid, caller_phone, tenant_id)
+    menu_index = tenant_registry.menu_index(tenant_registry.get(session.tenant_id), session.menu_version)
+    if menu_index is not None and session.menu_version != menu_index.version:
+        session.menu_version = menu_index.version
+        session_store.save(session)
+    return session, menu_index
 
-        twiml = say_and_hangup("Great! Your order is placed. Thank you!")
-        return Response(content=twiml, media_type="application/xml")
 
-    twiml = gather_speech(_action_url("/twilio/process"), "Okay, please tell me the order again.")
-    return Response(content=twiml, media_type="application/xml")
+@router.post("/twilio/voice")
+def twilio_voice(
+    CallSid: str = Form(...),
+    From: Optional[str] = Form(default=None),
+    To: Optional[str] = Form(default=None),
+) -> Response:
+    tenant = tenant_registry.resolve(To)
+    session_store.get_or_create(CallSid, From, tenant.id)
+    if settings.media_streams_enabled:
+        twiml = connect_stream(
+            _stream_url("/twilio/media"),
+            _action_url("/twilio/stream-end"),
+            greeting(tenant.name),
+            {"from": From or "", "tenant": tenant.id},
+        )
+    else:
+        twiml = gather_speech(_action_url("/twilio/process"), greeting(tenant.name))
+    return _twiml_response(twiml)
+
+
+@router.post("/twilio/process")
+async def twilio_process(
+    CallSid: str = Form(...),
+    From: Optional[str] = Form(default=None),
+    To: Optional[str] = Form(default=None),
+    SpeechResult: Optional[str] = Form(default=None),
+    Confidence: Optional[str] = Form(default=None),
+) -> Response:
+    session, menu_index = await asyncio.to_thread(call_context, CallSid, From, To)
+    turn = await process_speech(session, SpeechResult, menu_index, From, Confidence)
+    return _twiml_response(turn_twiml(turn))
+
+
+@router.post("/twilio/confirm")
+def twilio_confirm(
+    CallSid: str = Form(...),
+    From: Optional[str] = Form(default=None),
+    To: Optional[str] = Form(default=None),
+    SpeechResult: Optional[str] = Form(default=None),
+) -> Response:
+    session, menu_index = call_context(CallSid, From, To)
+    turn = confirm_speech(session, SpeechResult, menu_index, From)
+    return _twiml_response(turn_twiml(turn))
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Form, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+
+from app.api.routes_calls import NOT_CAUGHT, Turn, call_context, confirm_speech, process_speech, turn_twiml
+from app.services.audio import EnergyVAD, decode_ulaw
+from app.services.menu import MenuIndex
+from app.services.session_store import LiveSession
+from app.services.speech_to_text import Transcriber, get_transcriber
+from app.services.tts import tts_cache
+from app.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+OUTBOUND_CHUNK_BYTES = 1600
+STREAM_ENDING_TTL_SECONDS = 300.0
+
+stream_endings: Dict[str, Tuple[Turn, float]] = {}
+
+
+def remember_ending(call_sid: str, turn: Turn) -> None:
+    now = time.monotonic()
+    for stale_sid, (_, stored_at) in list(stream_endings.items()):
+        if now - stored_at > STREAM_ENDING_TTL_SECONDS:
+            stream_endings.pop(stale_sid, None)
+    stream_endings[call_sid] = (turn, now)
+
+
+class CallStream:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        transcriber: Transcriber,
+        vad: Optional[EnergyVAD] = None,
+    ) -> None:
+        self.websocket = websocket
+        self.menu_index: Optional[MenuIndex] = None
+        self.transcriber = transcriber
+        self.vad = vad or EnergyVAD()
+        self.stream_sid: Optional[str] = None
+        self.call_sid: Optional[str] = None
+        self.caller_phone: Optional[str] = None
+        self.session: Optional[LiveSession] = None
+        self.stage = "process"
+        self.ending: Optional[Turn] = None
+        self._utterances: asyncio.Queue = asyncio.Queue()
+        self._playing: Optional[str] = None
+        self._marks = 0
+
+    async def run(self) -> None:
+        receiver = asyncio.create_task(self._receive())
+        worker = asyncio.create_task(self._work())
+        done, pending = await asyncio.wait({receiver, worker}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception():
+                logger.error("Media stream failed: %s", task.exception())
+
+        if self.call_sid and self.ending:
+            remember_ending(self.call_sid, self.ending)
+            await self.websocket.close()
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                message = json.loads(await self.websocket.receive_text())
+                event = message.get("event")
+                if event == "start":
+                    await self._start(message.get("start") or {}, message.get("streamSid"))
+                elif event == "media":
+                    await self._media(message.get("media") or {})
+                elif event == "mark":
+                    if (message.get("mark") or {}).get("name") == self._playing:
+                        self._playing = None
+                elif event == "stop":
+                    return
+        except WebSocketDisconnect:
+            return
+
+    async def _start(self, start: Dict[str, Any], stream_sid: Optional[str]) -> None:
+        self.stream_sid = start.get("streamSid") or stream_sid
+        self.call_sid = start.get("callSid")
+        parameters = start.get("customParameters") or {}
+        self.caller_phone = parameters.get("from") or None
+        self.session, self.menu_index = await asyncio.to_thread(
+            call_context,
+            self.call_sid,
+            self.caller_phone,
+            tenant_id=parameters.get("tenant") or None,
+        )
+
+    async def _media(self, media: Dict[str, Any]) -> None:
+        if self.session is None or media.get("track", "inbound") != "inbound":
+            return
+        samples = decode_ulaw(base64.b64decode(media.get("payload") or ""))
+        was_speaking = self.vad.in_speech
+        utterance = self.vad.feed(samples)
+        if self.vad.in_speech and not was_speaking and self._playing:
+            await self._send({"event": "clear"})
+            self._playing = None
+        if utterance is not None:
+            self._utterances.put_nowait(utterance)
+
+    async def _work(self) -> None:
+        while self.ending is None:
+            utterance = await self._utterances.get()
+            self.ending = await self.handle_utterance(utterance)
+
+    async def handle_utterance(self, utterance: array) -> Optional[Turn]:
+        with timed("transcribe"):
+            text = await asyncio.to_thread(self.transcriber.transcribe, utterance)
+        if not text or not text.strip():
+            return None
+
+        if self.stage == "confirm":
+            turn = await asyncio.to_thread(
+                confirm_speech, self.session, text, self.menu_index, self.caller_phone
+            )
+        else:
+            turn = await process_speech(self.session, text, self.menu_index, self.caller_phone)
+
+        if turn.action not in ("process", "confirm"):
+            return turn
+        self.stage = turn.action
+        if not await self.say(turn.prompt, turn.cacheable):
+            return turn
+        return None
+
+    async def say(self, text: str, cacheable: bool = True) -> bool:
+        with timed("tts"):
+            audio = await asyncio.to_thread(tts_cache.stream_audio, text, cacheable)
+        if not audio:
+            return False
+        for start in range(0, len(audio), OUTBOUND_CHUNK_BYTES):
+            payload = base64.b64encode(audio[start:start + OUTBOUND_CHUNK_BYTES]).decode("ascii")
+            await self._send({"event": "media", "media": {"payload": payload}})
+        self._marks += 1
+        self._playing = f"turn-{self._marks}"
+        await self._send({"event": "mark", "mark": {"name": self._playing}})
+        return True
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        await self.websocket.send_text(json.dumps({**message, "streamSid": self.stream_sid}))
+
+
+@router.websocket("/twilio/media")
+async def twilio_media(websocket: WebSocket) -> None:
+    await websocket.accept()
+    stream = CallStream(websocket, get_transcriber())
+    await stream.run()
+
+
+@router.post("/twilio/stream-end")
+def twilio_stream_end(
+    CallSid: str = Form(...),
+) -> Response:
+    ending = stream_endings.pop(CallSid, None)
+    turn = ending[0] if ending else Turn("process", NOT_CAUGHT)
+    return Response(content=turn_twiml(turn), media_type="application/xml")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.deps import verify_dashboard_password
+from app.schemas import MenuReloadResponse
+from app.services.menu import MenuError
+from app.services.tenants import tenant_registry
+
+router = APIRouter()
+
+
+@router.get("/api/menu/versions")
+def menu_versions(_: None = Depends(verify_dashboard_password)) -> Dict[str, str]:
+    return tenant_registry.current_versions()
+
+
+@router.post("/api/menu/reload", response_model=MenuReloadResponse)
+def reload_menu(
+    tenant_id: Optional[str] = None,
+    _: None = Depends(verify_dashboard_password),
+) -> MenuReloadResponse:
+    tenant = tenant_registry.get(tenant_id)
+    if tenant_id and tenant.id != tenant_id:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+    try:
+        index, previous_version = tenant_registry.reload(tenant)
+    except MenuError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return MenuReloadResponse(tenant_id=tenant.id, version=index.version, previous_version=previous_version)
@@ -1,20 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, Iterator, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import verify_dashboard_password
 from app.db import get_db
-from app.models import Order
-from app.schemas import OrderResponse
-from app.services.printer_escpos import print_order
+from app.models import Order, OrderItem
+from app.schemas import BulkReprintRequest, BulkReprintResponse, OrderPage, OrderResponse
+from app.services.order_events import format_sse, order_events, order_summary
+from app.services.order_export import csv_chunks, export_rows, gzip_chunks, ndjson_chunks
+from app.services.printer_escpos import PrinterError, print_order, print_orders
+from app.utils.formatting import naive_utc
 
 router = APIRouter()
 
+SSE_HEARTBEAT_SECONDS = 15.0
+
 
 def _order_to_schema(order: Order) -> OrderResponse:
     return OrderResponse(
@@ -30,22 +40,146 @@ def _order_to_schema(order: Order) -> OrderResponse:
         status=order.status,
         raw_transcript=order.raw_transcript,
         confidence_notes=order.confidence_notes,
+        tenant_id=order.tenant_id,
     )
 
 
+def encode_cursor(timestamp: datetime, order_id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{order_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        timestamp, order_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), order_id
+    except (ValueError, UnicodeError, binascii.Error) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
 @router.get("/dashboard")
 def dashboard() -> FileResponse:
     path = Path(__file__).resolve().parents[1] / "static" / "dashboard.html"
     return FileResponse(path)
 
 
-@router.get("/api/orders", response_model=List[OrderResponse])
+@router.get("/api/orders", response_model=OrderPage)
 def list_orders(
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    caller_phone: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+    item_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _: None = Depends(verify_dashboard_password),
+) -> OrderPage:
+    query = db.query(
+        Order.id,
+        Order.timestamp,
+        Order.customer_name,
+        Order.caller_phone,
+        Order.order_type,
+        Order.total,
+        Order.status,
+        Order.tenant_id,
+    )
+    since = naive_utc(since)
+    until = naive_utc(until)
+    if status:
+        query = query.filter(Order.status == status)
+    if caller_phone:
+        query = query.filter(Order.caller_phone == caller_phone)
+    if tenant_id:
+        query = query.filter(Order.tenant_id == tenant_id)
+    if item_id:
+        item_orders = select(OrderItem.order_id).where(OrderItem.item_id == item_id)
+        if since:
+            item_orders = item_orders.where(OrderItem.timestamp >= since)
+        if until:
+            item_orders = item_orders.where(OrderItem.timestamp < until)
+        query = query.filter(Order.id.in_(item_orders))
+    if since:
+        query = query.filter(Order.timestamp >= since)
+    if until:
+        query = query.filter(Order.timestamp < until)
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                Order.timestamp < cursor_timestamp,
+                and_(Order.timestamp == cursor_timestamp, Order.id < cursor_id),
+            )
+        )
+
+    rows = query.order_by(Order.timestamp.desc(), Order.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    return OrderPage(items=[order_summary(row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/api/orders/stream")
+async def stream_orders(
+    request: Request,
+    _: None = Depends(verify_dashboard_password),
+) -> StreamingResponse:
+    async def events() -> AsyncIterator[str]:
+        async with order_events.subscribe() as queue:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event, payload = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event, payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/api/orders/export")
+def export_orders(
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+    gzip: bool = False,
     db: Session = Depends(get_db),
     _: None = Depends(verify_dashboard_password),
-) -> List[OrderResponse]:
-    orders = db.query(Order).order_by(Order.timestamp.desc()).all()
-    return [_order_to_schema(order) for order in orders]
+) -> StreamingResponse:
+    bind = db.get_bind()
+
+    def chunks() -> Iterator[Union[str, bytes]]:
+        export_db = Session(bind=bind)
+        try:
+            rows = export_rows(export_db, since, until, status, tenant_id)
+            text = csv_chunks(rows) if format == "csv" else ndjson_chunks(rows)
+            yield from gzip_chunks(text) if gzip else text
+        finally:
+            export_db.close()
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"orders.{format}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/api/orders/{order_id}", response_model=OrderResponse)
@@ -60,6 +194,32 @@ def get_order(
     return _order_to_schema(order)
 
 
+@router.post("/api/orders/reprint", response_model=BulkReprintResponse)
+def reprint_orders(
+    payload: BulkReprintRequest,
+    db: Session = Depends(get_db),
+    _: None = Depends(verify_dashboard_password),
+) -> BulkReprintResponse:
+    requested = list(dict.fromkeys(payload.order_ids))
+    found = {order.id: order for order in db.query(Order).filter(Order.id.in_(requested)).all()}
+    orders = [found[order_id] for order_id in requested if order_id in found]
+    try:
+        print_orders([_order_to_schema(order) for order in orders])
+    except PrinterError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+    for order in orders:
+        order.status = "printed"
+        db.add(order)
+    db.commit()
+    for order in orders:
+        order_events.publish_order(order)
+    return BulkReprintResponse(
+        status="printed",
+        printed=[order.id for order in orders],
+        missing=[order_id for order_id in requested if order_id not in found],
+    )
+
+
 @router.post("/api/orders/{order_id}/reprint")
 def reprint_order(
     order_id: str,
@@ -69,8 +229,12 @@ def reprint_order(
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    print_order(_order_to_schema(order))
+    try:
+        print_order(_order_to_schema(order))
+    except PrinterError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
     order.status = "printed"
     db.add(order)
     db.commit()
+    order_events.publish_order(order)
     return {"status": "printed"}
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from app.db import SessionLocal, init_db
+from app.services.analytics import rebuild_rollups
+from app.services.order_items import backfill_order_items
+from app.services.repricing import reprice_orders
+from app.services.tenants import DEFAULT_TENANT_ID, build_tenant_index, tenant_registry
+
+
+def reprice(args: argparse.Namespace) -> None:
+    tenant_registry.load(args.tenants)
+    tenants = [tenant_registry.get(args.tenant_id)] if args.tenant_id else tenant_registry.tenants()
+    for tenant in tenants:
+        tenant_ids: List[Optional[str]] = [tenant.id]
+        if tenant.id == DEFAULT_TENANT_ID:
+            tenant_ids.append(None)
+        result = reprice_orders(
+            SessionLocal,
+            build_tenant_index(tenant),
+            tenant_ids=tenant_ids,
+            since=args.since,
+            until=args.until,
+            dry_run=args.dry_run,
+        )
+        action = "would change" if args.dry_run else "changed"
+        print(f"{tenant.id}: scanned {result['scanned']}, {action} {result['changed']}")
+
+
+def backfill_rollups(args: argparse.Namespace) -> None:
+    print(f"rebuilt sales rollups from {rebuild_rollups(SessionLocal)} orders")
+
+
+def backfill_items(args: argparse.Namespace) -> None:
+    print(f"backfilled order_items for {backfill_order_items(SessionLocal)} orders")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Takeaway order maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reprice_parser = commands.add_parser("reprice", help="recompute order totals from the current menu prices")
+    reprice_parser.add_argument("--tenant-id", help="only reprice orders for this tenant")
+    reprice_parser.add_argument("--tenants", default=None, help="tenants file, defaults to TENANTS_PATH")
+    reprice_parser.add_argument("--since", type=datetime.fromisoformat)
+    reprice_parser.add_argument("--until", type=datetime.fromisoformat)
+    reprice_parser.add_argument("--dry-run", action="store_true")
+    reprice_parser.set_defaults(handler=reprice)
+
+    rollups_parser = commands.add_parser("backfill-rollups", help="rebuild the sales rollup tables from all orders")
+    rollups_parser.set_defaults(handler=backfill_rollups)
+
+    items_parser = commands.add_parser("backfill-order-items", help="write order_items rows for orders that have none")
+    items_parser.set_defaults(handler=backfill_items)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    Path("./data").mkdir(parents=True, exist_ok=True)
+    init_db()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
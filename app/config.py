@@ -15,27 +15,76 @@ class Settings(BaseSettings):
 
     openai_api_key: str = Field(default="", repr=False)
     openai_model: str = "gpt-4o-mini"
+    openai_base_url: str = ""
     openai_tts_model: str = "gpt-4o-mini-tts"
+    openai_tts_voice: str = "alloy"
     use_openai_tts: bool = False
+    tts_cache_dir: str = "./data/tts"
+    tts_cache_max_files: int = 500
 
     dashboard_password: str = "changeme"
     fallback_forward_number: str = ""
 
     sqlite_path: str = "sqlite:///./data/orders.db"
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 20000
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    group_commit_enabled: bool = True
+    group_commit_window_ms: float = 2.0
+    group_commit_max_batch: int = 64
     menu_path: str = "./menu.json"
+    tenants_path: str = ""
+    menu_cache_size: int = 16
+    menu_version_cache_size: int = 32
+    menu_watch_interval_seconds: float = 5.0
+    menu_match_threshold: float = 0.5
+    menu_match_margin: float = 0.15
     tax_rate: float = 0.0
     log_level: str = "INFO"
 
+    session_flush_interval_seconds: float = 2.0
+    session_idle_seconds: int = 1800
+    session_abandon_after_seconds: int = 3600
+    session_archive_after_seconds: int = 86400
+    session_archive_dir: str = "./data/archive"
+    maintenance_interval_seconds: float = 600.0
+    maintenance_vacuum_interval_seconds: float = 86400.0
+
     llm_max_retries: int = 2
     llm_timeout_seconds: int = 30
+    llm_connect_timeout_seconds: float = 5.0
+    llm_max_connections: int = 200
+    llm_max_keepalive_connections: int = 50
+    llm_keepalive_expiry_seconds: float = 60.0
+    llm_streaming: bool = False
+    local_parser_enabled: bool = True
+    extraction_cache_enabled: bool = True
+    extraction_cache_size: int = 1024
+    extraction_cache_ttl_seconds: float = 600.0
 
     printer_mode: str = "dryrun"
     printer_usb_vendor_id: Optional[int] = None
     printer_usb_product_id: Optional[int] = None
     printer_network_host: str = ""
     printer_network_port: int = 9100
+    printer_timeout_seconds: float = 10.0
+    printer_max_idle_seconds: float = 300.0
+    print_max_attempts: int = 5
+    print_retry_base_seconds: float = 2.0
+    print_retry_max_seconds: float = 300.0
+    print_poll_interval_seconds: float = 5.0
 
     twilio_voice: str = "Polly.Joanna"
+    media_streams_enabled: bool = False
+    stream_transcriber: str = "whisper"
+    stream_vad_threshold: float = 500.0
+    stream_silence_ms: int = 600
+    stream_min_speech_ms: int = 200
+    stream_max_utterance_seconds: int = 15
 
 
 settings = Settings()
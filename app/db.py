@@ -1,20 +1,107 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import settings
 
-engine = create_engine(
-    settings.sqlite_path,
-    connect_args={"check_same_thread": False} if settings.sqlite_path.startswith("sqlite") else {},
-)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs: dict = {}
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.sqlite_busy_timeout_ms / 1000,
+        }
+    if not _is_sqlite_memory(url):
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+        )
+    return kwargs
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any) -> None:
+    journal_mode = settings.sqlite_journal_mode.upper()
+    synchronous = settings.sqlite_synchronous.upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLite journal mode: {settings.sqlite_journal_mode}")
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported SQLite synchronous mode: {settings.sqlite_synchronous}")
+
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+engine = create_engine(settings.sqlite_path, **_engine_kwargs(settings.sqlite_path))
+
+if _is_sqlite(settings.sqlite_path):
+
+    @event.listens_for(engine, "connect")
+    def _on_sqlite_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        apply_sqlite_pragmas(dbapi_connection)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def add_missing_columns(bind: Any = None) -> List[str]:
+    bind = bind or engine
+    inspector = inspect(bind)
+    added: List[str] = []
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name} automatically")
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+                added.append(f"{table.name}.{column.name}")
+    for name in added:
+        logger.info("Added column %s", name)
+    return added
 
 
 def get_db():
@@ -23,3 +110,104 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+Work = Tuple[Callable[[Session], Any], Future]
+
+
+class GroupCommitter:
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        self.session_factory = session_factory or sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=engine,
+        )
+        self._queue: "queue.Queue[Optional[Work]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def run(self, work: Callable[[Session], T]) -> T:
+        if not settings.group_commit_enabled:
+            return self._run_alone(work)
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((work, future))
+        return future.result()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout=5)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch: List[Work] = [first]
+            stopping = False
+            deadline = time.monotonic() + settings.group_commit_window_ms / 1000
+            while len(batch) < settings.group_commit_max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+            if stopping:
+                return
+
+    def _commit_batch(self, batch: List[Work]) -> None:
+        if len(batch) > 1:
+            db = self.session_factory()
+            try:
+                results = [work(db) for work, _ in batch]
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                logger.warning("Group commit of %s writes failed, retrying individually: %s", len(batch), exc)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+                return
+            finally:
+                db.close()
+
+        for work, future in batch:
+            try:
+                future.set_result(self._run_alone(work))
+            except Exception as exc:
+                future.set_exception(exc)
+
+    def _run_alone(self, work: Callable[[Session], T]) -> T:
+        db = self.session_factory()
+        try:
+            result = work(db)
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+group_committer = GroupCommitter()
@@ -1,42 +1,94 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
 
-from app.api.routes_calls import router as calls_router
+from app.api.routes_analytics import router as analytics_router
+from app.api.routes_calls import fixed_prompts, router as calls_router
+from app.api.routes_media import router as media_router
+from app.api.routes_menu import router as menu_router
 from app.api.routes_orders import router as orders_router
 from app.config import settings
-from app.db import init_db
-from app.services.menu import load_menu
+from app.db import group_committer, init_db
+from app.services.llm_client import close_llm_client
+from app.services.maintenance import session_maintenance
+from app.services.order_items import order_item_backfill
+from app.services.print_outbox import print_worker
+from app.services.printer_escpos import printer_manager
+from app.services.session_store import session_store
+from app.services.tenants import menu_watcher, tenant_registry
+from app.services.tts import TTS_ROUTE, tts_cache
 from app.utils.logging import configure_logging
+from app.utils.metrics import METRICS_CONTENT_TYPE, WEBHOOK_SECONDS, render_metrics
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title=settings.app_name)
 
+app.include_router(analytics_router)
 app.include_router(calls_router)
+app.include_router(media_router)
+app.include_router(menu_router)
 app.include_router(orders_router)
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount(TTS_ROUTE, StaticFiles(directory=settings.tts_cache_dir, check_dir=False), name="tts")
+
+
+@app.middleware("http")
+async def webhook_timing(request: Request, call_next):
+    if not request.url.path.startswith("/twilio/"):
+        return await call_next(request)
+    started = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        WEBHOOK_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - started)
 
 
 @app.on_event("startup")
-def startup() -> None:
+async def startup() -> None:
     Path("./data").mkdir(parents=True, exist_ok=True)
     init_db()
     try:
-        menu = load_menu(settings.menu_path)
+        tenant_registry.load()
     except Exception as exc:
-        logger.error("Failed to load menu: %s", exc)
-        menu = {"categories": []}
-    app.state.menu = menu
+        logger.error("Failed to load tenants: %s", exc)
+    tenant_registry.menu_index(tenant_registry.default)
+    await menu_watcher.start()
+    await print_worker.start()
+    await session_store.start()
+    await session_maintenance.start()
+    await order_item_backfill.start()
+    tts_cache.render_later(fixed_prompts())
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await menu_watcher.stop()
+    await order_item_backfill.stop()
+    await session_maintenance.stop()
+    await session_store.stop()
+    await print_worker.stop()
+    printer_manager.close_all()
+    group_committer.stop()
+    tts_cache.close()
+    await close_llm_client()
 
 
 @app.get("/")
 def root() -> dict:
     return {"status": "ok", "app": settings.app_name}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
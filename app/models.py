@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Float, Index, Integer, String, Text
 
 from app.db import Base
 
@@ -22,8 +22,38 @@ class Order(Base):
     status = Column(String, default="received", nullable=False)
     raw_transcript = Column(Text, default="", nullable=False)
     confidence_notes = Column(Text, nullable=True)
+    tenant_id = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_orders_timestamp_id", "timestamp", "id"),
+        Index("ix_orders_status_timestamp", "status", "timestamp"),
+        Index("ix_orders_caller_phone_timestamp", "caller_phone", "timestamp"),
+        Index("ix_orders_tenant_timestamp", "tenant_id", "timestamp"),
+    )
+
+
+class OrderItem(Base):
+    __tablename__ = "order_items"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(String, nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    item_id = Column(String, nullable=True)
+    name = Column(String, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    size = Column(String, nullable=True)
+    addons = Column(JSON, nullable=False)
+    modifiers = Column(JSON, nullable=False)
+    special_instructions = Column(Text, nullable=True)
+    tenant_id = Column(String, nullable=True)
+    timestamp = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_order_items_item_timestamp", "item_id", "timestamp"),
+        Index("ix_order_items_timestamp", "timestamp"),
+    )
+
 
 class CallSession(Base):
     __tablename__ = "call_sessions"
@@ -35,5 +65,38 @@ class CallSession(Base):
     attempts = Column(Integer, default=0, nullable=False)
     llm_failures = Column(Integer, default=0, nullable=False)
     status = Column(String, default="in_progress", nullable=False)
+    tenant_id = Column(String, nullable=True)
+    menu_version = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (Index("ix_call_sessions_status_updated_at", "status", "updated_at"),)
+
+
+class PrintJob(Base):
+    __tablename__ = "print_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(String, nullable=False, index=True)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, default="pending", nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    last_error = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class SalesRollup(Base):
+    __tablename__ = "sales_rollups"
+
+    tenant_id = Column(String, primary_key=True)
+    period = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    dimension = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    orders = Column(Integer, default=0, nullable=False)
+    quantity = Column(Integer, default=0, nullable=False)
+    revenue_cents = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (Index("ix_sales_rollups_period_bucket", "period", "bucket"),)
@@ -33,6 +33,7 @@ class Order(BaseModel):
     status: str = "received"
     raw_transcript: str = ""
     confidence_notes: Optional[str] = None
+    tenant_id: Optional[str] = None
 
 
 class OrderDraftItem(BaseModel):
@@ -75,3 +76,65 @@ class OrderResponse(BaseModel):
     status: str
     raw_transcript: str
     confidence_notes: Optional[str] = None
+    tenant_id: Optional[str] = None
+
+
+class OrderSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    order_id: str
+    timestamp: datetime
+    customer_name: Optional[str] = None
+    caller_phone: str
+    order_type: str
+    total: Optional[float] = None
+    status: str
+    tenant_id: Optional[str] = None
+
+
+class OrderPage(BaseModel):
+    items: List[OrderSummary]
+    next_cursor: Optional[str] = None
+
+
+class BulkReprintRequest(BaseModel):
+    order_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
+class BulkReprintResponse(BaseModel):
+    status: str
+    printed: List[str]
+    missing: List[str]
+
+
+class MenuReloadResponse(BaseModel):
+    tenant_id: str
+    version: str
+    previous_version: Optional[str] = None
+
+
+class SalesRow(BaseModel):
+    key: str
+    orders: int
+    quantity: int
+    revenue: Optional[float] = None
+
+
+class SalesBucket(BaseModel):
+    bucket: datetime
+    orders: int
+    quantity: int
+    revenue: float
+
+
+class AnalyticsResponse(BaseModel):
+    period: str
+    since: datetime
+    until: Optional[datetime] = None
+    tenant_id: Optional[str] = None
+    orders: int
+    quantity: int
+    revenue: float
+    buckets: List[SalesBucket]
+    order_types: List[SalesRow]
+    items: List[SalesRow]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import Order, SalesRollup
+from app.schemas import AnalyticsResponse, SalesBucket, SalesRow
+from app.services.order_items import item_quantity
+from app.services.pricing import from_cents, to_cents
+from app.services.tenants import DEFAULT_TENANT_ID
+from app.utils.formatting import naive_utc
+
+ROLLUP_PERIODS = ("hour", "day")
+BACKFILL_BATCH_SIZE = 1000
+
+RollupKey = Tuple[str, str, datetime, str, str]
+
+
+def bucket_start(timestamp: datetime, period: str) -> datetime:
+    if period == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if period == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup period: {period}")
+
+
+def rollup_deltas(order: Any) -> Dict[RollupKey, List[int]]:
+    tenant_id = order.tenant_id or DEFAULT_TENANT_ID
+    revenue = to_cents(order.total) or 0
+    item_quantities: Dict[str, int] = defaultdict(int)
+    for item in order.items or []:
+        item_key = item.get("item_id") or item.get("name")
+        if item_key:
+            item_quantities[item_key] += item_quantity(item)
+    quantity = sum(item_quantities.values())
+
+    deltas: Dict[RollupKey, List[int]] = {}
+    for period in ROLLUP_PERIODS:
+        bucket = bucket_start(order.timestamp, period)
+        deltas[(tenant_id, period, bucket, "total", "")] = [1, quantity, revenue]
+        deltas[(tenant_id, period, bucket, "order_type", order.order_type)] = [1, quantity, revenue]
+        for item_key, item_total in item_quantities.items():
+            deltas[(tenant_id, period, bucket, "item", item_key)] = [1, item_total, 0]
+    return deltas
+
+
+def _rows(deltas: Dict[RollupKey, List[int]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "tenant_id": tenant_id,
+            "period": period,
+            "bucket": bucket,
+            "dimension": dimension,
+            "key": key,
+            "orders": orders,
+            "quantity": quantity,
+            "revenue_cents": revenue,
+        }
+        for (tenant_id, period, bucket, dimension, key), (orders, quantity, revenue) in deltas.items()
+    ]
+
+
+def record_order(db: Session, order: Any) -> None:
+    statement = insert(SalesRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=["tenant_id", "period", "bucket", "dimension", "key"],
+        set_={
+            "orders": SalesRollup.orders + statement.excluded.orders,
+            "quantity": SalesRollup.quantity + statement.excluded.quantity,
+            "revenue_cents": SalesRollup.revenue_cents + statement.excluded.revenue_cents,
+        },
+    )
+    db.execute(statement, _rows(rollup_deltas(order)))
+
+
+def record_revenue_change(db: Session, order: Any, previous_total: Optional[float]) -> None:
+    delta = (to_cents(order.total) or 0) - (to_cents(previous_total) or 0)
+    if not delta:
+        return
+    tenant_id = order.tenant_id or DEFAULT_TENANT_ID
+    for period in ROLLUP_PERIODS:
+        bucket = bucket_start(order.timestamp, period)
+        for dimension, key in (("total", ""), ("order_type", order.order_type)):
+            db.execute(
+                update(SalesRollup)
+                .where(
+                    SalesRollup.tenant_id == tenant_id,
+                    SalesRollup.period == period,
+                    SalesRollup.bucket == bucket,
+                    SalesRollup.dimension == dimension,
+                    SalesRollup.key == key,
+                )
+                .values(revenue_cents=SalesRollup.revenue_cents + delta)
+            )
+
+
+def rebuild_rollups(session_factory: Callable[[], Session]) -> int:
+    totals: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0, 0])
+    db = session_factory()
+    try:
+        db.execute(delete(SalesRollup))
+        orders = db.query(Order.tenant_id, Order.timestamp, Order.order_type, Order.items, Order.total)
+        scanned = 0
+        for order in orders.yield_per(BACKFILL_BATCH_SIZE):
+            scanned += 1
+            for key, values in rollup_deltas(order).items():
+                total = totals[key]
+                for position, value in enumerate(values):
+                    total[position] += value
+        rows = _rows(totals)
+        if rows:
+            db.execute(insert(SalesRollup), rows)
+        db.commit()
+        return scanned
+    finally:
+        db.close()
+
+
+def _sales_rows(rows: Iterable[Any], with_revenue: bool = True) -> List[SalesRow]:
+    return [
+        SalesRow(
+            key=row.key,
+            orders=row.orders,
+            quantity=row.quantity,
+            revenue=from_cents(row.revenue_cents) if with_revenue else None,
+        )
+        for row in rows
+    ]
+
+
+def sales_summary(
+    db: Session,
+    period: str,
+    since: datetime,
+    until: Optional[datetime] = None,
+    tenant_id: Optional[str] = None,
+) -> AnalyticsResponse:
+    since = naive_utc(since)
+    until = naive_utc(until)
+    filters = [SalesRollup.period == period, SalesRollup.bucket >= bucket_start(since, period)]
+    if until:
+        filters.append(SalesRollup.bucket < until)
+    if tenant_id:
+        filters.append(SalesRollup.tenant_id == tenant_id)
+
+    orders = func.sum(SalesRollup.orders).label("orders")
+    quantity = func.sum(SalesRollup.quantity).label("quantity")
+    revenue = func.sum(SalesRollup.revenue_cents).label("revenue_cents")
+
+    buckets = (
+        db.query(SalesRollup.bucket, orders, quantity, revenue)
+        .filter(*filters, SalesRollup.dimension == "total")
+        .group_by(SalesRollup.bucket)
+        .order_by(SalesRollup.bucket)
+        .all()
+    )
+    grouped = (
+        db.query(SalesRollup.dimension, SalesRollup.key, orders, quantity, revenue)
+        .filter(*filters, SalesRollup.dimension.in_(("order_type", "item")))
+        .group_by(SalesRollup.dimension, SalesRollup.key)
+        .order_by(quantity.desc(), SalesRollup.key)
+        .all()
+    )
+
+    return AnalyticsResponse(
+        period=period,
+        since=bucket_start(since, period),
+        until=until,
+        tenant_id=tenant_id,
+        orders=sum(row.orders for row in buckets),
+        quantity=sum(row.quantity for row in buckets),
+        revenue=from_cents(sum(row.revenue_cents for row in buckets)),
+        buckets=[
+            SalesBucket(
+                bucket=row.bucket,
+                orders=row.orders,
+                quantity=row.quantity,
+                revenue=from_cents(row.revenue_cents),
+            )
+            for row in buckets
+        ],
+        order_types=_sales_rows(row for row in grouped if row.dimension == "order_type"),
+        items=_sales_rows((row for row in grouped if row.dimension == "item"), with_revenue=False),
+    )
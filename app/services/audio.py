@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import math
+import wave
+from array import array
+from collections import deque
+from typing import Deque, Iterable, List, Optional
+
+from app.config import settings
+
+SAMPLE_RATE = 8000
+FRAME_MS = 20
+
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 32635
+
+
+def _decode_ulaw_byte(value: int) -> int:
+    value = ~value & 0xFF
+    sign = value & 0x80
+    exponent = (value >> 4) & 0x07
+    mantissa = value & 0x0F
+    sample = (((mantissa << 3) + _ULAW_BIAS) << exponent) - _ULAW_BIAS
+    return -sample if sign else sample
+
+
+def _encode_ulaw_sample(sample: int) -> int:
+    sign = 0x80 if sample < 0 else 0
+    magnitude = min(abs(sample), _ULAW_CLIP) + _ULAW_BIAS
+    exponent = max(magnitude.bit_length() - 8, 0)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return ~(sign | (exponent << 4) | mantissa) & 0xFF
+
+
+ULAW_DECODE = [_decode_ulaw_byte(value) for value in range(256)]
+
+
+def decode_ulaw(data: bytes) -> array:
+    return array("h", [ULAW_DECODE[value] for value in data])
+
+
+def encode_ulaw(samples: Iterable[int]) -> bytes:
+    return bytes(_encode_ulaw_sample(sample) for sample in samples)
+
+
+def pcm16_samples(data: bytes) -> array:
+    samples = array("h")
+    samples.frombytes(data[: len(data) - len(data) % 2])
+    return samples
+
+
+def downsample(samples: array, factor: int) -> array:
+    if factor <= 1:
+        return samples
+    usable = len(samples) - len(samples) % factor
+    return array(
+        "h",
+        [sum(samples[start:start + factor]) // factor for start in range(0, usable, factor)],
+    )
+
+
+def rms(samples: array) -> float:
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+def wav_bytes(samples: array, sample_rate: int = SAMPLE_RATE) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class EnergyVAD:
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        silence_ms: Optional[int] = None,
+        min_speech_ms: Optional[int] = None,
+        max_utterance_ms: Optional[int] = None,
+        preroll_ms: int = 200,
+    ) -> None:
+        self.threshold = threshold if threshold is not None else settings.stream_vad_threshold
+        self.silence_ms = silence_ms if silence_ms is not None else settings.stream_silence_ms
+        self.min_speech_ms = min_speech_ms if min_speech_ms is not None else settings.stream_min_speech_ms
+        self.max_utterance_ms = (
+            max_utterance_ms if max_utterance_ms is not None else settings.stream_max_utterance_seconds * 1000
+        )
+        self.in_speech = False
+        self._preroll: Deque[array] = deque(maxlen=max(preroll_ms // FRAME_MS, 1))
+        self._frames: List[array] = []
+        self._speech_ms = 0
+        self._silence_ms = 0
+
+    def feed(self, samples: array) -> Optional[array]:
+        frame_ms = len(samples) * 1000 // SAMPLE_RATE
+        voiced = rms(samples) >= self.threshold
+
+        if not self.in_speech:
+            self._preroll.append(samples)
+            if voiced:
+                self.in_speech = True
+                self._frames = list(self._preroll)
+                self._preroll.clear()
+                self._speech_ms = frame_ms
+                self._silence_ms = 0
+            return None
+
+        self._frames.append(samples)
+        if voiced:
+            self._speech_ms += frame_ms
+            self._silence_ms = 0
+        else:
+            self._silence_ms += frame_ms
+
+        total_ms = self._speech_ms + self._silence_ms
+        if self._silence_ms >= self.silence_ms or total_ms >= self.max_utterance_ms:
+            return self._finish()
+        return None
+
+    def _finish(self) -> Optional[array]:
+        frames, speech_ms = self._frames, self._speech_ms
+        self.in_speech = False
+        self._frames = []
+        self._speech_ms = 0
+        self._silence_ms = 0
+        if speech_ms < self.min_speech_ms:
+            return None
+        utterance = array("h")
+        for frame in frames:
+            utterance.extend(frame)
+        return utterance
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.services.menu import normalize_name
+from app.utils.metrics import EXTRACTION_CACHE
+
+CacheKey = Tuple[str, str, str]
+
+
+@dataclass
+class CachedResponse:
+    parsed: Dict[str, Any]
+    raw_response: str
+    expires_at: float
+
+
+def cache_key(transcript: str, sanitized_state: Dict[str, Any], menu_version: str) -> CacheKey:
+    utterance = " ".join(normalize_name(transcript).split())
+    state = json.dumps(sanitized_state, sort_keys=True, default=str)
+    return utterance, hashlib.sha256(state.encode("utf-8")).hexdigest()[:16], menu_version
+
+
+class ExtractionCache:
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None) -> None:
+        self.max_entries = max_entries if max_entries is not None else settings.extraction_cache_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.extraction_cache_ttl_seconds
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            EXTRACTION_CACHE.labels(result="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        EXTRACTION_CACHE.labels(result="hit").inc()
+        return entry
+
+    def put(self, key: CacheKey, parsed: Dict[str, Any], raw_response: str) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = CachedResponse(parsed, raw_response, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+extraction_cache = ExtractionCache()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class _Frame:
+    kind: str
+    start: int
+    path: Path
+    state: str
+    key: Optional[str] = None
+    index: int = 0
+    value_start: int = -1
+
+
+@dataclass
+class IncrementalJSONParser:
+    text: str = ""
+    result: Dict[str, Any] = field(default_factory=dict)
+    closed: bool = False
+    failed: bool = False
+    _pos: int = 0
+    _stack: List[_Frame] = field(default_factory=list)
+    _in_string: bool = False
+    _escaped: bool = False
+    _string_start: int = -1
+
+    def feed(self, chunk: str) -> None:
+        self.text += chunk
+        while self._pos < len(self.text) and not (self.closed or self.failed):
+            self._step(self.text[self._pos])
+            self._pos += 1
+
+    def has_keys(self, keys: Iterable[str]) -> bool:
+        return all(key in self.result for key in keys)
+
+    def _step(self, char: str) -> None:
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                self._end_string()
+            return
+
+        if not self._stack:
+            if char == "{":
+                self._stack.append(_Frame("object", self._pos, (), "key"))
+            return
+
+        frame = self._stack[-1]
+        if frame.state == "primitive":
+            if char not in ",}]":
+                return
+            self._emit(frame, self._load(frame.value_start, self._pos))
+            if self.failed:
+                return
+
+        if char in WHITESPACE:
+            return
+        if char == '"':
+            self._in_string = True
+            self._string_start = self._pos
+        elif char in "{[" and frame.state == "value":
+            child_path = frame.path + ((frame.key,) if frame.kind == "object" else (frame.index,))
+            if char == "{":
+                self._stack.append(_Frame("object", self._pos, child_path, "key"))
+            else:
+                self._stack.append(_Frame("array", self._pos, child_path, "value"))
+        elif char in "}]":
+            self._close(frame)
+        elif char == ":" and frame.kind == "object":
+            frame.state = "value"
+        elif char == ",":
+            if frame.kind == "object":
+                frame.state = "key"
+            else:
+                frame.index += 1
+                frame.state = "value"
+        elif frame.state == "value":
+            frame.state = "primitive"
+            frame.value_start = self._pos
+        else:
+            self.failed = True
+
+    def _end_string(self) -> None:
+        frame = self._stack[-1]
+        value = self._load(self._string_start, self._pos + 1)
+        if self.failed:
+            return
+        if frame.kind == "object" and frame.state == "key":
+            frame.key = value
+            frame.state = "colon"
+        else:
+            self._emit(frame, value)
+
+    def _close(self, frame: _Frame) -> None:
+        self._stack.pop()
+        value = self._load(frame.start, self._pos + 1)
+        if self.failed:
+            return
+        if not self._stack:
+            if isinstance(value, dict):
+                self.result = value
+            self.closed = True
+            return
+        self._emit(self._stack[-1], value)
+
+    def _emit(self, frame: _Frame, value: Any) -> None:
+        path = frame.path + ((frame.key,) if frame.kind == "object" else (frame.index,))
+        frame.state = "done"
+        if len(path) == 1:
+            self.result[path[0]] = value
+
+    def _load(self, start: int, end: int) -> Any:
+        try:
+            return json.loads(self.text[start:end])
+        except json.JSONDecodeError:
+            self.failed = True
+            return None
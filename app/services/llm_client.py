@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Any] = None
+_audio_client: Optional[Any] = None
+_audio_lock = threading.Lock()
+
+
+def get_llm_client() -> Any:
+    global _client
+    if _client is not None:
+        return _client
+
+    if not settings.openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY not configured")
+
+    try:
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    except ImportError as exc:
+        raise RuntimeError("openai package missing") from exc
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=settings.llm_connect_timeout_seconds),
+    )
+    _client = AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url or None,
+        http_client=http_client,
+        max_retries=0,
+    )
+    logger.info(
+        "LLM client created (max_connections=%s, keepalive=%s)",
+        settings.llm_max_connections,
+        settings.llm_max_keepalive_connections,
+    )
+    return _client
+
+
+def get_audio_client() -> Any:
+    global _audio_client
+    with _audio_lock:
+        if _audio_client is not None:
+            return _audio_client
+
+        if not settings.openai_api_key:
+            raise RuntimeError("OPENAI_API_KEY not configured")
+
+        try:
+            from openai import OpenAI
+        except ImportError as exc:
+            raise RuntimeError("openai package missing") from exc
+
+        _audio_client = OpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+        )
+        return _audio_client
+
+
+async def close_llm_client() -> None:
+    global _client, _audio_client
+    with _audio_lock:
+        audio_client, _audio_client = _audio_client, None
+    if audio_client is not None:
+        audio_client.close()
+    if _client is None:
+        return
+    client, _client = _client, None
+    await client.close()
@@ -3,17 +3,52 @@ from __future__ import annotations
 import json
 import logging
 import re
-from dataclasses import dataclass
-from difflib import get_close_matches
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from app.config import settings
 from app.schemas import OrderDraft, OrderDraftItem
-from app.services.menu import menu_lookup, menu_prompt, normalize_name
+from app.services.extraction_cache import cache_key, extraction_cache
+from app.services.json_stream import IncrementalJSONParser
+from app.services.llm_client import get_llm_client
+from app.services.local_parser import parse_locally
+from app.services.menu import MenuIndex, ensure_menu_index
+from app.utils.metrics import EXTRACTIONS, LLM_FAILURES, LLM_RETRIES, timed
 
 logger = logging.getLogger(__name__)
 
 
+SYSTEM_PROMPT = (
+    "You are an AI order-taking assistant. "
+    "Only use items from the provided menu. "
+    "If the caller asks for something not on the menu, "
+    "politely offer the closest alternatives from the menu. "
+    "Respond in strict JSON with keys: changes, missing_fields, question. "
+    "changes is a list of edits to the existing order state, using only what the caller just said: "
+    '{"op": "add", "item": {...}} adds an item; '
+    '{"op": "remove", "index": n} removes the existing item at index n; '
+    '{"op": "modify", "index": n, "fields": {...}} updates fields of the existing item at index n; '
+    '{"op": "set", "field": "customer_name" | "order_type" | "special_instructions", "value": ...} sets an order field. '
+    "Each item has name, item_id (if known), quantity, size, modifiers, addons, special_instructions. "
+    "Use an empty changes list when nothing changed. "
+    "If information is missing, list it in missing_fields and ask one concise follow-up question."
+)
+
+DELTA_OPS = {"add", "remove", "modify", "set"}
+SETTABLE_FIELDS = {"customer_name", "order_type", "special_instructions"}
+ITEM_FIELDS = set(OrderDraftItem.model_fields)
+
+STATE_KEYS = {
+    "customer_name",
+    "order_type",
+    "items",
+    "special_instructions",
+    "subtotal",
+    "tax",
+    "total",
+}
+
+
 @dataclass
 class ExtractionResult:
     order: Dict[str, Any]
@@ -21,26 +56,57 @@ class ExtractionResult:
     question: Optional[str]
     raw_response: str
     error: Optional[str] = None
+    source: str = "llm"
+    usage: Dict[str, int] = field(default_factory=dict)
+    question_cacheable: bool = True
 
 
-def extract_or_question(
+async def extract_or_question(
     transcript: str,
-    menu: Dict[str, Any],
+    menu: Union[Dict[str, Any], MenuIndex],
     current_order_state: Optional[Dict[str, Any]] = None,
 ) -> ExtractionResult:
+    index = ensure_menu_index(menu)
     current_order_state = current_order_state or {}
 
+    if settings.local_parser_enabled:
+        with timed("local_parse"):
+            local_order = parse_locally(transcript, index, current_order_state)
+        if local_order is not None:
+            with timed("validate"):
+                validated_order, missing_fields, question = validate_order_draft(local_order, index)
+            EXTRACTIONS.labels(source="local").inc()
+            return ExtractionResult(
+                order=validated_order,
+                missing_fields=missing_fields,
+                question=question,
+                raw_response="",
+                source="local",
+            )
+
+    key = None
+    if settings.extraction_cache_enabled:
+        key = cache_key(transcript, sanitize_state(current_order_state), index.version)
+        cached = extraction_cache.get(key)
+        if cached is not None:
+            return _finish_extraction(cached.parsed, cached.raw_response, current_order_state, index, "cache", {})
+
     response_text = ""
+    usage: Dict[str, int] = {}
     last_error: Optional[Exception] = None
-    for _ in range(max(settings.llm_max_retries, 1)):
+    for attempt in range(max(settings.llm_max_retries, 1)):
+        if attempt:
+            LLM_RETRIES.inc()
         try:
-            response_text = _call_llm(transcript, menu, current_order_state)
+            with timed("llm_call"):
+                response_text, usage = await _call_llm(transcript, index, current_order_state)
             break
         except Exception as exc:
             last_error = exc
             logger.error("LLM call failed: %s", exc)
 
     if not response_text and last_error:
+        LLM_FAILURES.inc()
         return ExtractionResult(
             order=current_order_state,
             missing_fields=["items"],
@@ -49,19 +115,41 @@ def extract_or_question(
             error=str(last_error),
         )
 
-    parsed = parse_llm_response(response_text)
-    order_data = parsed.get("order") or {}
+    with timed("parse_response"):
+        parsed = parse_llm_response(response_text)
+    if key is not None and parsed:
+        extraction_cache.put(key, parsed, response_text)
+    return _finish_extraction(parsed, response_text, current_order_state, index, "llm", usage)
+
+
+def _finish_extraction(
+    parsed: Dict[str, Any],
+    response_text: str,
+    current_order_state: Dict[str, Any],
+    index: MenuIndex,
+    source: str,
+    usage: Dict[str, int],
+) -> ExtractionResult:
     missing_fields = parsed.get("missing_fields") or []
     question = parsed.get("question")
     if not isinstance(missing_fields, list):
         missing_fields = []
 
-    merged_order = merge_order_state(current_order_state, order_data)
-    validated_order, computed_missing, auto_question = validate_order_draft(merged_order, menu)
+    changes = parsed.get("changes")
+    if isinstance(changes, list):
+        merged_order = apply_order_delta(current_order_state, changes)
+    else:
+        merged_order = merge_order_state(current_order_state, parsed.get("order") or {})
+    with timed("validate"):
+        validated_order, computed_missing, auto_question = validate_order_draft(merged_order, index)
+    EXTRACTIONS.labels(source=source).inc()
 
+    question_cacheable = not question
     if computed_missing:
         missing_fields = computed_missing
-        question = question or auto_question
+        if not question:
+            question = auto_question
+            question_cacheable = not _question_field(computed_missing).endswith(".menu_item")
 
     return ExtractionResult(
         order=validated_order,
@@ -69,60 +157,136 @@ def extract_or_question(
         question=question,
         raw_response=response_text,
         error=None,
+        source=source,
+        usage=usage,
+        question_cacheable=question_cacheable,
     )
 
 
-def _call_llm(transcript: str, menu: Dict[str, Any], current_order_state: Dict[str, Any]) -> str:
-    if not settings.openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY not configured")
+async def _call_llm(
+    transcript: str,
+    index: MenuIndex,
+    current_order_state: Dict[str, Any],
+) -> Tuple[str, Dict[str, int]]:
+    client = get_llm_client()
+    messages = build_messages(transcript, index, current_order_state)
+    if settings.llm_streaming:
+        return await _stream_llm(client, messages, index)
+
+    response = await client.chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        temperature=0.2,
+        timeout=settings.llm_timeout_seconds,
+    )
+    usage = _usage_report(response, index)
+    _log_usage(usage, index)
+    return response.choices[0].message.content or "", usage
+
+
+def _log_usage(usage: Dict[str, int], index: MenuIndex) -> None:
+    logger.info(
+        "LLM usage menu=%s prompt_tokens=%s cached_tokens=%s completion_tokens=%s prefix_chars=%s",
+        index.version,
+        usage.get("prompt_tokens"),
+        usage.get("cached_tokens"),
+        usage.get("completion_tokens"),
+        usage.get("prefix_chars"),
+    )
 
+
+async def _stream_llm(
+    client: Any,
+    messages: List[Dict[str, str]],
+    index: MenuIndex,
+) -> Tuple[str, Dict[str, int]]:
+    parser = IncrementalJSONParser()
+    usage = _usage_report(None, index)
+    stream = await client.chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        temperature=0.2,
+        timeout=settings.llm_timeout_seconds,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    finished = False
     try:
-        from openai import OpenAI
-    except ImportError as exc:
-        raise RuntimeError("openai package missing") from exc
-
-    system_prompt = (
-        "You are an AI order-taking assistant. "
-        "Only use items from the provided menu. "
-        "If the caller asks for something not on the menu, "
-        "politely offer the closest alternatives from the menu. "
-        "Respond in strict JSON with keys: order, missing_fields, question. "
-        "The order object should include customer_name (optional), order_type, "
-        "and items (array). Each item has name, item_id (if known), quantity, size, "
-        "modifiers, addons, special_instructions. "
-        "If information is missing, list it in missing_fields and ask one concise follow-up question."
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = _usage_report(chunk, index)
+            if not chunk.choices:
+                continue
+            parser.feed(chunk.choices[0].delta.content or "")
+            if parser.closed or parser.failed or _response_complete(parser):
+                break
+        else:
+            finished = True
+    finally:
+        await stream.close()
+
+    if finished:
+        _log_usage(usage, index)
+    else:
+        logger.info(
+            "LLM usage menu=%s unavailable: stream closed after %s chars prefix_chars=%s",
+            index.version,
+            len(parser.text),
+            usage.get("prefix_chars"),
+        )
+
+    if _response_complete(parser):
+        return json.dumps(parser.result), usage
+    return parser.text, usage
+
+
+def _response_complete(parser: IncrementalJSONParser) -> bool:
+    return parser.has_keys(("missing_fields", "question")) and (
+        parser.has_keys(("changes",)) or parser.has_keys(("order",))
     )
 
-    allowed_keys = {
-        "customer_name",
-        "order_type",
-        "items",
-        "special_instructions",
-        "subtotal",
-        "tax",
-        "total",
-    }
-    sanitized_state = {key: value for key, value in current_order_state.items() if key in allowed_keys}
 
+def prompt_prefix(index: MenuIndex) -> str:
+    prefix = index.derived.get("prompt_prefix")
+    if prefix is None:
+        prefix = f"{SYSTEM_PROMPT}\n\nMenu (version {index.version}):\n{index.prompt}"
+        index.derived["prompt_prefix"] = prefix
+    return prefix
+
+
+def sanitize_state(current_order_state: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in current_order_state.items() if key in STATE_KEYS}
+
+
+def build_messages(
+    transcript: str,
+    index: MenuIndex,
+    current_order_state: Dict[str, Any],
+) -> List[Dict[str, str]]:
+    state = sanitize_state(current_order_state)
+    if state.get("items"):
+        state["items"] = [{"index": position, **item} for position, item in enumerate(state["items"])]
     user_prompt = (
-        f"Menu:\n{menu_prompt(menu)}\n\n"
-        f"Existing order state (JSON): {json.dumps(sanitized_state)}\n"
+        f"Existing order state (JSON): {json.dumps(state, sort_keys=True)}\n"
         f"Caller said: {transcript}\n"
         "Return JSON only."
     )
+    return [
+        {"role": "system", "content": prompt_prefix(index)},
+        {"role": "user", "content": user_prompt},
+    ]
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    response = client.chat.completions.create(
-        model=settings.openai_model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.2,
-        timeout=settings.llm_timeout_seconds,
-    )
 
-    return response.choices[0].message.content or ""
+def _usage_report(response: Any, index: MenuIndex) -> Dict[str, int]:
+    report = {"prefix_chars": len(prompt_prefix(index))}
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return report
+    report["prompt_tokens"] = getattr(usage, "prompt_tokens", 0) or 0
+    report["completion_tokens"] = getattr(usage, "completion_tokens", 0) or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    report["cached_tokens"] = getattr(details, "cached_tokens", 0) or 0
+    return report
 
 
 def parse_llm_response(text: str) -> Dict[str, Any]:
@@ -156,10 +320,44 @@ def merge_order_state(existing: Dict[str, Any], incoming: Dict[str, Any]) -> Dic
     return merged
 
 
+def apply_order_delta(existing: Dict[str, Any], changes: List[Any]) -> Dict[str, Any]:
+    merged = dict(existing)
+    items: List[Optional[Dict[str, Any]]] = [dict(item) for item in existing.get("items") or []]
+    original_count = len(items)
+    for change in changes:
+        if not isinstance(change, dict) or change.get("op") not in DELTA_OPS:
+            logger.warning("Ignoring order change: %s", change)
+            continue
+        op = change["op"]
+        if op == "add":
+            item = change.get("item")
+            if isinstance(item, dict):
+                items.append({key: value for key, value in item.items() if key in ITEM_FIELDS})
+                continue
+        elif op == "set":
+            if change.get("field") in SETTABLE_FIELDS:
+                merged[change["field"]] = change.get("value")
+                continue
+        else:
+            position = change.get("index")
+            if isinstance(position, int) and 0 <= position < original_count and items[position] is not None:
+                if op == "remove":
+                    items[position] = None
+                    continue
+                fields = change.get("fields")
+                if isinstance(fields, dict):
+                    items[position].update({key: value for key, value in fields.items() if key in ITEM_FIELDS})
+                    continue
+        logger.warning("Ignoring order change: %s", change)
+    merged["items"] = [item for item in items if item is not None]
+    return merged
+
+
 def validate_order_draft(
     order_data: Dict[str, Any],
-    menu: Dict[str, Any],
+    menu: Union[Dict[str, Any], MenuIndex],
 ) -> Tuple[Dict[str, Any], List[str], Optional[str]]:
+    index = ensure_menu_index(menu)
     order = OrderDraft(**order_data)
     missing: List[str] = []
     question: Optional[str] = None
@@ -172,36 +370,28 @@ def validate_order_draft(
         question = "What would you like to order?"
         return order.model_dump(), missing, question
 
-    lookup = menu_lookup(menu)
-    for index, item in enumerate(order.items):
-        missing.extend(_validate_item(item, index, lookup, menu, order))
+    for position, item in enumerate(order.items):
+        missing.extend(_validate_item(item, position, index))
 
     if missing and not question:
-        question = build_question(missing, order, menu)
+        question = build_question(missing, order, index)
 
     return order.model_dump(), missing, question
 
 
-def _validate_item(
-    item: OrderDraftItem,
-    index: int,
-    lookup: Dict[str, Dict[str, Any]],
-    menu: Dict[str, Any],
-    order: OrderDraft,
-) -> List[str]:
+def _validate_item(item: OrderDraftItem, index: int, menu_index: MenuIndex) -> List[str]:
     missing: List[str] = []
     if not item.name:
         missing.append(f"items[{index}].name")
         return missing
 
-    normalized = normalize_name(item.name)
-    menu_item = lookup.get(normalized)
+    menu_item = menu_index.fuzzy_resolve(item.name)
     if not menu_item:
         missing.append(f"items[{index}].menu_item")
         return missing
 
-    if not item.item_id:
-        item.item_id = menu_item.get("id")
+    item.name = menu_item.get("name")
+    item.item_id = menu_item.get("id")
 
     if not item.quantity:
         missing.append(f"items[{index}].quantity")
@@ -210,45 +400,53 @@ def _validate_item(
     if variants and not item.size:
         missing.append(f"items[{index}].size")
 
-    if variants and item.size and item.size not in variants:
-        missing.append(f"items[{index}].size")
+    if variants and item.size:
+        size = menu_index.match_variant(menu_item.get("id"), item.size)
+        if size:
+            item.size = size
+        else:
+            missing.append(f"items[{index}].size")
 
     return missing
 
 
-def build_question(missing_fields: List[str], order: OrderDraft, menu: Dict[str, Any]) -> str:
+def build_question(
+    missing_fields: List[str],
+    order: OrderDraft,
+    menu: Union[Dict[str, Any], MenuIndex],
+) -> str:
     if "items" in missing_fields:
         return "What would you like to order?"
 
-    for field in missing_fields:
-        if field.endswith(".menu_item"):
-            index = int(field.split("[")[1].split("]")[0])
-            item_name = order.items[index].name if index < len(order.items) else "that item"
-            alternatives = closest_menu_items(item_name or "", menu)
-            if alternatives:
-                return (
-                    f"Sorry, we do not have {item_name}. "
-                    f"We do have {', '.join(alternatives)}. Which would you like?"
-                )
-            return f"Sorry, we do not have {item_name}. What would you like instead?"
-
-        if field.endswith(".quantity"):
-            return "How many would you like?"
-
-        if field.endswith(".size"):
-            index = int(field.split("[")[1].split("]")[0])
-            item_name = order.items[index].name if index < len(order.items) else "that item"
-            return f"What size would you like for the {item_name}?"
+    missing = _question_field(missing_fields)
+    if missing.endswith(".menu_item"):
+        index = int(missing.split("[")[1].split("]")[0])
+        item_name = order.items[index].name if index < len(order.items) else "that item"
+        alternatives = closest_menu_items(item_name or "", menu)
+        if alternatives:
+            return (
+                f"Sorry, we do not have {item_name}. "
+                f"We do have {', '.join(alternatives)}. Which would you like?"
+            )
+        return f"Sorry, we do not have {item_name}. What would you like instead?"
+
+    if missing.endswith(".quantity"):
+        return "How many would you like?"
+
+    if missing.endswith(".size"):
+        index = int(missing.split("[")[1].split("]")[0])
+        item_name = order.items[index].name if index < len(order.items) else "that item"
+        return f"What size would you like for the {item_name}?"
 
     return "Could you clarify your order?"
 
 
-def closest_menu_items(name: str, menu: Dict[str, Any]) -> List[str]:
-    names = [
-        item.get("name", "")
-        for category in menu.get("categories", [])
-        for item in category.get("items", [])
-    ]
-    normalized_map = {normalize_name(n): n for n in names}
-    matches = get_close_matches(normalize_name(name), list(normalized_map.keys()), n=2, cutoff=0.4)
-    return [normalized_map[m] for m in matches]
+def _question_field(missing_fields: List[str]) -> str:
+    for missing in missing_fields:
+        if missing.endswith((".menu_item", ".quantity", ".size")):
+            return missing
+    return ""
+
+
+def closest_menu_items(name: str, menu: Union[Dict[str, Any], MenuIndex]) -> List[str]:
+    return ensure_menu_index(menu).suggest(name)
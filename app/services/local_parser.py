@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.menu import MenuIndex, normalize_name
+
+NUMBER_WORDS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+}
+
+FILLER_PHRASES = [
+    "can i get",
+    "can i have",
+    "could i get",
+    "could i have",
+    "i would like",
+    "id like",
+    "i want",
+    "ill have",
+    "ill take",
+    "give me",
+    "let me get",
+    "let me have",
+    "thank you",
+    "please",
+    "thanks",
+    "and",
+    "also",
+    "plus",
+    "of",
+    "some",
+    "just",
+    "um",
+    "uh",
+    "the",
+]
+
+MAX_QUANTITY = 50
+
+Phrase = Tuple[str, ...]
+
+
+def _singular(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def _phrase(text: str) -> Phrase:
+    return tuple(_singular(token) for token in normalize_name(text).split())
+
+
+class LocalGrammar:
+    def __init__(self, index: MenuIndex) -> None:
+        self.items: Dict[Phrase, Dict[str, Any]] = {}
+        self.sizes: Dict[Phrase, str] = {}
+        self.addons: Dict[str, Dict[Phrase, str]] = {}
+        for item in index.by_id.values():
+            for name in [item.get("name", "")] + list(item.get("aliases") or []):
+                key = _phrase(name)
+                if key:
+                    self.items.setdefault(key, item)
+            for variant in item.get("variants") or []:
+                key = _phrase(variant)
+                if key:
+                    self.sizes.setdefault(key, normalize_name(variant))
+            self.addons[item["id"]] = {_phrase(addon): addon for addon in item.get("addons") or []}
+        self.fillers = {_phrase(text) for text in FILLER_PHRASES}
+        self.max_len = max(
+            [len(key) for key in list(self.items) + list(self.sizes) + list(self.fillers)] or [1]
+        )
+
+    def match(self, table: Dict[Phrase, Any], tokens: List[str], start: int) -> Tuple[Any, int]:
+        for length in range(min(self.max_len, len(tokens) - start), 0, -1):
+            key = tuple(tokens[start:start + length])
+            if key in table:
+                return table[key], length
+        return None, 0
+
+    def match_filler(self, tokens: List[str], start: int) -> int:
+        for length in range(min(self.max_len, len(tokens) - start), 0, -1):
+            if tuple(tokens[start:start + length]) in self.fillers:
+                return length
+        return 0
+
+
+def get_grammar(index: MenuIndex) -> LocalGrammar:
+    grammar = index.derived.get("local_grammar")
+    if grammar is None:
+        grammar = LocalGrammar(index)
+        index.derived["local_grammar"] = grammar
+    return grammar
+
+
+def _quantity(token: str) -> Optional[int]:
+    if token.isdigit():
+        value = int(token)
+        return value if 0 < value <= MAX_QUANTITY else None
+    return NUMBER_WORDS.get(token)
+
+
+def parse_locally(
+    transcript: str,
+    index: MenuIndex,
+    current_order_state: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    current_order_state = current_order_state or {}
+    tokens = [_singular(token) for token in normalize_name(transcript or "").split()]
+    if not tokens:
+        return None
+
+    grammar = get_grammar(index)
+    existing_items = [dict(item) for item in current_order_state.get("items") or []]
+
+    size_answer = _parse_size_answer(tokens, grammar, index, existing_items)
+    if size_answer is not None:
+        return {**current_order_state, "items": size_answer}
+
+    new_items = _parse_items(tokens, grammar, index)
+    if not new_items:
+        return None
+
+    unresolved = [
+        position
+        for position, item in enumerate(existing_items)
+        if not index.fuzzy_resolve(item.get("name")) and not index.resolve(item_id=item.get("item_id"))
+    ]
+    if len(unresolved) > 1:
+        return None
+    if unresolved:
+        position = unresolved[0]
+        existing_items[position:position + 1] = new_items
+        return {**current_order_state, "items": existing_items}
+    return {**current_order_state, "items": existing_items + new_items}
+
+
+def _parse_size_answer(
+    tokens: List[str],
+    grammar: LocalGrammar,
+    index: MenuIndex,
+    existing_items: List[Dict[str, Any]],
+) -> Optional[List[Dict[str, Any]]]:
+    size: Optional[str] = None
+    position = 0
+    while position < len(tokens):
+        skip = grammar.match_filler(tokens, position)
+        if skip:
+            position += skip
+            continue
+        if size is not None:
+            return None
+        size, length = grammar.match(grammar.sizes, tokens, position)
+        if size is None:
+            return None
+        position += length
+    if size is None:
+        return None
+
+    for item in existing_items:
+        if item.get("size") or not item.get("item_id"):
+            continue
+        variant = index.match_variant(item["item_id"], size)
+        if variant:
+            item["size"] = variant
+            return existing_items
+    return None
+
+
+def _parse_items(tokens: List[str], grammar: LocalGrammar, index: MenuIndex) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    quantity: Optional[int] = None
+    size: Optional[str] = None
+    in_addons = False
+    after_item = False
+    position = 0
+
+    while position < len(tokens):
+        token = tokens[position]
+        trailing_size = after_item
+        after_item = False
+
+        if in_addons and items:
+            addon, length = grammar.match(grammar.addons[items[-1]["item_id"]], tokens, position)
+            if addon:
+                if addon not in items[-1]["addons"]:
+                    items[-1]["addons"].append(addon)
+                position += length
+                continue
+
+        if token == "with" and items:
+            in_addons = True
+            position += 1
+            continue
+
+        menu_item, length = grammar.match(grammar.items, tokens, position)
+        if menu_item:
+            item = _new_item(menu_item, quantity or 1)
+            if size is not None:
+                item["size"] = index.match_variant(item["item_id"], size)
+                if item["size"] is None:
+                    return []
+            items.append(item)
+            quantity, size, in_addons = None, None, False
+            after_item = True
+            position += length
+            continue
+
+        variant, length = grammar.match(grammar.sizes, tokens, position)
+        if variant:
+            if size is not None:
+                return []
+            if trailing_size and not items[-1]["size"]:
+                items[-1]["size"] = index.match_variant(items[-1]["item_id"], variant)
+                if items[-1]["size"] is None:
+                    return []
+            else:
+                size = variant
+            position += length
+            continue
+
+        value = _quantity(token)
+        if value is not None:
+            if quantity is not None or size is not None:
+                return []
+            quantity = value
+            in_addons = False
+            position += 1
+            continue
+
+        skip = grammar.match_filler(tokens, position)
+        if skip:
+            position += skip
+            continue
+
+        return []
+
+    if quantity is not None or size is not None:
+        return []
+    return items
+
+
+def _new_item(menu_item: Dict[str, Any], quantity: int) -> Dict[str, Any]:
+    return {
+        "item_id": menu_item.get("id"),
+        "name": menu_item.get("name"),
+        "quantity": quantity,
+        "size": None,
+        "modifiers": [],
+        "addons": [],
+        "special_instructions": None,
+    }
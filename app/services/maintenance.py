@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import CallSession
+from app.services.session_store import ENDED_STATUSES
+from app.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def _session_record(session: CallSession) -> Dict[str, Any]:
+    return {
+        "id": session.id,
+        "caller_phone": session.caller_phone,
+        "transcript": session.transcript,
+        "order_state": session.order_state,
+        "attempts": session.attempts,
+        "llm_failures": session.llm_failures,
+        "status": session.status,
+        "tenant_id": session.tenant_id,
+        "menu_version": session.menu_version,
+        "created_at": session.created_at.isoformat() if session.created_at else None,
+        "updated_at": session.updated_at.isoformat() if session.updated_at else None,
+    }
+
+
+class SessionMaintenance:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        archive_dir: Optional[str] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.archive_dir = Path(archive_dir or settings.session_archive_dir)
+        self._last_vacuum = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def expire_stale(self, now: Optional[datetime] = None) -> int:
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=settings.session_abandon_after_seconds)
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(CallSession)
+                .where(CallSession.status == "in_progress", CallSession.updated_at < cutoff)
+                .values(status="abandoned")
+            )
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    def archive(self, now: Optional[datetime] = None) -> int:
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=settings.session_archive_after_seconds)
+        archived = 0
+        while True:
+            db = self.session_factory()
+            try:
+                sessions = (
+                    db.query(CallSession)
+                    .filter(CallSession.status.in_(ENDED_STATUSES), CallSession.updated_at < cutoff)
+                    .order_by(CallSession.updated_at)
+                    .limit(ARCHIVE_BATCH_SIZE)
+                    .all()
+                )
+                if not sessions:
+                    return archived
+                self._write_archive(sessions)
+                for session in sessions:
+                    db.delete(session)
+                db.commit()
+                archived += len(sessions)
+            finally:
+                db.close()
+
+    def _write_archive(self, sessions: List[CallSession]) -> None:
+        by_day: Dict[str, List[CallSession]] = defaultdict(list)
+        for session in sessions:
+            by_day[(session.created_at or session.updated_at).strftime("%Y-%m-%d")].append(session)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        for day, day_sessions in by_day.items():
+            path = self.archive_dir / f"call_sessions-{day}.ndjson.gz"
+            with gzip.open(path, "at", encoding="utf-8") as handle:
+                for session in day_sessions:
+                    handle.write(json.dumps(_session_record(session)) + "\n")
+
+    def vacuum(self) -> None:
+        db = self.session_factory()
+        try:
+            bind = db.get_bind()
+        finally:
+            db.close()
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("VACUUM")
+        self._last_vacuum = time.monotonic()
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        with timed("maintenance"):
+            abandoned = self.expire_stale(now)
+            archived = self.archive(now)
+            vacuum_due = time.monotonic() - self._last_vacuum >= settings.maintenance_vacuum_interval_seconds
+            if archived and vacuum_due:
+                self.vacuum()
+        if abandoned or archived:
+            logger.info("Session maintenance: %s abandoned, %s archived", abandoned, archived)
+        return {"abandoned": abandoned, "archived": archived}
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as exc:
+                logger.error("Session maintenance failed: %s", exc)
+            await asyncio.sleep(settings.maintenance_interval_seconds)
+
+
+session_maintenance = SessionMaintenance()
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from app.config import settings
+from app.services.menu_matcher import MenuMatcher
+
+FUZZY_MATCH_CACHE_SIZE = 4096
 
 
 class MenuError(ValueError):
@@ -31,6 +36,11 @@ def validate_menu(menu: Dict[str, Any]) -> None:
         for item in category["items"]:
             if "id" not in item or "name" not in item:
                 raise MenuError("Each item requires id and name")
+            if not isinstance(item.get("aliases", []), list):
+                raise MenuError("Item aliases must be a list")
+            for key in ("variant_prices", "addon_prices"):
+                if not isinstance(item.get(key, {}), dict):
+                    raise MenuError(f"Item {key} must be an object")
 
 
 def all_items(menu: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -54,6 +64,95 @@ def normalize_name(text: str) -> str:
     return "".join(ch.lower() for ch in text if ch.isalnum() or ch.isspace()).strip()
 
 
+@dataclass
+class MenuIndex:
+    menu: Dict[str, Any]
+    version: str = ""
+    prompt: str = ""
+    by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    aliases: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    variants: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    addons: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    matcher: MenuMatcher = field(default_factory=lambda: MenuMatcher([]), repr=False)
+    derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def resolve(self, name: Optional[str] = None, item_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if item_id and item_id in self.by_id:
+            return self.by_id[item_id]
+        if not name:
+            return None
+        key = normalize_name(name)
+        return self.by_name.get(key) or self.aliases.get(key)
+
+    def fuzzy_resolve(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not name:
+            return None
+        exact = self.resolve(name)
+        if exact:
+            return exact
+        matches = self.derived.setdefault("fuzzy_matches", {})
+        key = normalize_name(name)
+        if key not in matches:
+            if len(matches) >= FUZZY_MATCH_CACHE_SIZE:
+                matches.clear()
+            matches[key] = self.matcher.best(
+                name,
+                threshold=settings.menu_match_threshold,
+                margin=settings.menu_match_margin,
+            )
+        return matches[key]
+
+    def suggest(self, name: str, limit: int = 2) -> List[str]:
+        return [item.get("name", "") for item in self.matcher.suggest(name, limit=limit)]
+
+    def match_variant(self, item_id: str, size: Optional[str]) -> Optional[str]:
+        if not size:
+            return None
+        return self.variants.get(item_id, {}).get(normalize_name(size))
+
+    def match_addon(self, item_id: str, addon: Optional[str]) -> Optional[str]:
+        if not addon:
+            return None
+        return self.addons.get(item_id, {}).get(normalize_name(addon))
+
+    def display_names(self) -> List[str]:
+        return [item.get("name", "") for item in self.by_name.values()]
+
+
+def menu_version(menu: Dict[str, Any]) -> str:
+    canonical = json.dumps(menu, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def build_menu_index(menu: Dict[str, Any]) -> MenuIndex:
+    index = MenuIndex(menu=menu, version=menu_version(menu), prompt=menu_prompt(menu))
+    phrases = []
+    for item in all_items(menu):
+        item_id = item.get("id")
+        key = normalize_name(item.get("name", ""))
+        if key:
+            index.by_name[key] = item
+        if item_id:
+            index.by_id[item_id] = item
+            index.variants[item_id] = {normalize_name(v): v for v in item.get("variants") or []}
+            index.addons[item_id] = {normalize_name(a): a for a in item.get("addons") or []}
+        phrases.append((item.get("name", ""), item))
+        for alias in item.get("aliases") or []:
+            phrases.append((alias, item))
+            alias_key = normalize_name(alias)
+            if alias_key and alias_key not in index.by_name:
+                index.aliases.setdefault(alias_key, item)
+    index.matcher = MenuMatcher(phrases)
+    return index
+
+
+def ensure_menu_index(menu: Union[Dict[str, Any], MenuIndex]) -> MenuIndex:
+    if isinstance(menu, MenuIndex):
+        return menu
+    return build_menu_index(menu)
+
+
 def menu_prompt(menu: Dict[str, Any]) -> str:
     lines = []
     for category in menu.get("categories", []):
@@ -69,26 +168,3 @@ def menu_prompt(menu: Dict[str, Any]) -> str:
             lines.append(line)
     return "\n".join(lines)
 
-
-def price_items(items: List[Dict[str, Any]], menu: Dict[str, Any]) -> Dict[str, float | None]:
-    lookup = menu_lookup(menu)
-    subtotal = 0.0
-    priced_any = False
-    for item in items:
-        name = item.get("name", "")
-        quantity = item.get("quantity") or 0
-        menu_item = lookup.get(normalize_name(name))
-        if not menu_item or menu_item.get("price") is None:
-            continue
-        priced_any = True
-        try:
-            qty = int(quantity)
-        except (TypeError, ValueError):
-            qty = 0
-        subtotal += float(menu_item.get("price", 0.0)) * qty
-
-    if not priced_any:
-        return {"subtotal": None, "tax": None, "total": None}
-
-    tax = round(subtotal * settings.tax_rate, 2)
-    return {"subtotal": round(subtotal, 2), "tax": tax, "total": round(subtotal + tax, 2)}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+VOWELS = set("aeiou")
+
+
+def compact(text: str) -> str:
+    return "".join(ch for ch in text.lower() if ch.isalnum())
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {compact(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def phonetic_key(text: str) -> str:
+    word = compact(text)
+    if not word:
+        return ""
+    for prefix, replacement in (("kn", "n"), ("gn", "n"), ("pn", "n"), ("wr", "r"), ("x", "s")):
+        if word.startswith(prefix):
+            word = replacement + word[len(prefix):]
+            break
+    for pattern, replacement in (
+        ("sch", "sk"),
+        ("tch", "x"),
+        ("ph", "f"),
+        ("ck", "k"),
+        ("sh", "x"),
+        ("ch", "x"),
+        ("th", "0"),
+        ("dg", "j"),
+        ("wh", "w"),
+        ("gh", "k"),
+    ):
+        word = word.replace(pattern, replacement)
+
+    key: List[str] = []
+    for position, ch in enumerate(word):
+        following = word[position + 1] if position + 1 < len(word) else ""
+        if ch in VOWELS or ch in "hwy":
+            if position == 0:
+                key.append("a" if ch in VOWELS else ch)
+            continue
+        if ch == "c":
+            ch = "s" if following in ("e", "i", "y") else "k"
+        elif ch == "g":
+            ch = "j" if following in ("e", "i", "y") else "k"
+        elif ch == "q":
+            ch = "k"
+        elif ch == "x":
+            key.append("k")
+            ch = "s"
+        elif ch == "z":
+            ch = "s"
+        elif ch == "v":
+            ch = "f"
+        if not key or key[-1] != ch:
+            key.append(ch)
+    return "".join(key)
+
+
+def _bigrams(text: str) -> Set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+@dataclass
+class _Entry:
+    item: Dict[str, Any]
+    trigram_count: int
+    phonetic: str
+    phonetic_bigrams: Set[str]
+
+
+class MenuMatcher:
+    def __init__(self, phrases: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self.entries: List[_Entry] = []
+        self.trigram_index: Dict[str, List[int]] = {}
+        self.phonetic_index: Dict[str, List[int]] = {}
+        for phrase, item in phrases:
+            grams = trigrams(phrase)
+            if not compact(phrase):
+                continue
+            key = phonetic_key(phrase)
+            position = len(self.entries)
+            self.entries.append(_Entry(item, len(grams), key, _bigrams(key)))
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(position)
+            self.phonetic_index.setdefault(key, []).append(position)
+
+    def scores(self, text: str) -> List[Tuple[float, Dict[str, Any]]]:
+        grams = trigrams(text)
+        if not compact(text):
+            return []
+        shared: Counter = Counter()
+        for gram in grams:
+            for position in self.trigram_index.get(gram, ()):
+                shared[position] += 1
+        key = phonetic_key(text)
+        for position in self.phonetic_index.get(key, ()):
+            shared.setdefault(position, 0)
+        key_bigrams = _bigrams(key)
+
+        best: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        for position, count in shared.items():
+            entry = self.entries[position]
+            trigram_score = 2 * count / (len(grams) + entry.trigram_count)
+            if entry.phonetic == key:
+                phonetic_score = 1.0
+            else:
+                union = key_bigrams | entry.phonetic_bigrams
+                phonetic_score = len(key_bigrams & entry.phonetic_bigrams) / len(union) if union else 0.0
+            score = 0.6 * trigram_score + 0.4 * phonetic_score
+            item_id = entry.item.get("id", "")
+            if item_id not in best or best[item_id][0] < score:
+                best[item_id] = (score, entry.item)
+        return sorted(best.values(), key=lambda pair: pair[0], reverse=True)
+
+    def best(self, text: str, threshold: float, margin: float = 0.0) -> Optional[Dict[str, Any]]:
+        ranked = self.scores(text)
+        if not ranked or ranked[0][0] < threshold:
+            return None
+        if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < margin:
+            return None
+        return ranked[0][1]
+
+    def suggest(self, text: str, limit: int = 2, threshold: float = 0.3) -> List[Dict[str, Any]]:
+        return [item for score, item in self.scores(text)[:limit] if score >= threshold]
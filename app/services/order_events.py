@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from app.schemas import OrderSummary
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+def order_summary(row: Any) -> OrderSummary:
+    return OrderSummary(
+        order_id=row.id,
+        timestamp=row.timestamp,
+        customer_name=row.customer_name,
+        caller_phone=row.caller_phone,
+        order_type=row.order_type,
+        total=row.total,
+        status=row.status,
+        tenant_id=row.tenant_id,
+    )
+
+
+class OrderEventBroker:
+    def __init__(self, queue_size: int = 100) -> None:
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    def publish(self, event: str, payload: Dict[str, Any]) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(event, payload)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, event, payload)
+
+    def publish_order(self, order: Any) -> None:
+        self.publish("order", order_summary(order).model_dump(mode="json"))
+
+    def _dispatch(self, event: str, payload: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((event, payload))
+            except asyncio.QueueFull:
+                logger.warning("Dropping order event for slow dashboard subscriber")
+
+
+def format_sse(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+order_events = OrderEventBroker()
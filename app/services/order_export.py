@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import Order
+from app.services.order_items import item_quantity
+from app.utils.formatting import naive_utc
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FLUSH_ROWS = 200
+
+EXPORT_COLUMNS = [
+    "order_id",
+    "timestamp",
+    "tenant_id",
+    "customer_name",
+    "caller_phone",
+    "order_type",
+    "status",
+    "items",
+    "subtotal",
+    "tax",
+    "total",
+]
+
+
+def export_rows(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    query = db.query(
+        Order.id,
+        Order.timestamp,
+        Order.tenant_id,
+        Order.customer_name,
+        Order.caller_phone,
+        Order.order_type,
+        Order.status,
+        Order.items,
+        Order.subtotal,
+        Order.tax,
+        Order.total,
+    )
+    since = naive_utc(since)
+    until = naive_utc(until)
+    if since:
+        query = query.filter(Order.timestamp >= since)
+    if until:
+        query = query.filter(Order.timestamp < until)
+    if status:
+        query = query.filter(Order.status == status)
+    if tenant_id:
+        query = query.filter(Order.tenant_id == tenant_id)
+
+    for row in query.order_by(Order.timestamp, Order.id).yield_per(EXPORT_BATCH_SIZE):
+        yield {
+            "order_id": row.id,
+            "timestamp": row.timestamp.isoformat(),
+            "tenant_id": row.tenant_id,
+            "customer_name": row.customer_name,
+            "caller_phone": row.caller_phone,
+            "order_type": row.order_type,
+            "status": row.status,
+            "items": row.items or [],
+            "subtotal": row.subtotal,
+            "tax": row.tax,
+            "total": row.total,
+        }
+
+
+def items_text(items: List[Dict[str, Any]]) -> str:
+    parts = []
+    for item in items:
+        text = f"{item_quantity(item)}x {item.get('name') or ''}"
+        if item.get("size"):
+            text += f" ({item['size']})"
+        extras = list(item.get("modifiers") or []) + list(item.get("addons") or [])
+        if extras:
+            text += " + " + ", ".join(str(extra) for extra in extras)
+        parts.append(text)
+    return "; ".join(parts)
+
+
+def csv_chunks(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        writer.writerow({**row, "items": items_text(row["items"])})
+        if count % EXPORT_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    lines: List[str] = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) >= EXPORT_FLUSH_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import Order, OrderItem
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def item_quantity(item: Dict[str, Any]) -> int:
+    try:
+        return int(item.get("quantity") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def order_item_rows(order: Order) -> List[OrderItem]:
+    return [
+        OrderItem(
+            order_id=order.id,
+            position=position,
+            item_id=item.get("item_id"),
+            name=item.get("name") or "",
+            quantity=item_quantity(item),
+            size=item.get("size"),
+            addons=list(item.get("addons") or []),
+            modifiers=list(item.get("modifiers") or []),
+            special_instructions=item.get("special_instructions"),
+            tenant_id=order.tenant_id,
+            timestamp=order.timestamp,
+        )
+        for position, item in enumerate(order.items or [])
+    ]
+
+
+def add_order_items(db: Session, order: Order) -> List[OrderItem]:
+    rows = order_item_rows(order)
+    db.add_all(rows)
+    return rows
+
+
+def backfill_order_items(
+    session_factory: Callable[[], Session],
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    missing = ~exists().where(OrderItem.order_id == Order.id)
+    backfilled = 0
+    last_id = ""
+    while stop is None or not stop.is_set():
+        db = session_factory()
+        try:
+            orders = (
+                db.query(Order)
+                .filter(Order.id > last_id, missing)
+                .order_by(Order.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not orders:
+                break
+            for order in orders:
+                add_order_items(db, order)
+            db.commit()
+            backfilled += len(orders)
+            last_id = orders[-1].id
+        finally:
+            db.close()
+    if backfilled:
+        logger.info("Backfilled order_items for %s orders", backfilled)
+    return backfilled
+
+
+class OrderItemBackfill:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.to_thread(backfill_order_items, self.session_factory, stop=self._stop)
+        except Exception as exc:
+            logger.error("Order item backfill failed: %s", exc)
+
+
+order_item_backfill = OrderItemBackfill()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from app.config import settings
+from app.services.menu import MenuError, MenuIndex, ensure_menu_index, normalize_name
+
+
+def to_cents(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Optional[int]) -> Optional[float]:
+    if cents is None:
+        return None
+    return cents / 100
+
+
+def _tax_rate(value: Any) -> Optional[Decimal]:
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+@dataclass(frozen=True)
+class ItemPrice:
+    base: Optional[int]
+    tax_rate: Decimal
+    variants: Dict[str, int] = field(default_factory=dict)
+    addons: Dict[str, int] = field(default_factory=dict)
+
+    def unit(self, size: Optional[str], addons: Iterable[str]) -> Optional[int]:
+        unit = self.variants.get(normalize_name(size)) if size else None
+        if unit is None:
+            unit = self.base
+        if unit is None:
+            return None
+        return unit + sum(self.addons.get(normalize_name(addon), 0) for addon in addons if addon)
+
+
+@dataclass(frozen=True)
+class Totals:
+    subtotal: Optional[int]
+    tax: Optional[int]
+    total: Optional[int]
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        return {
+            "subtotal": from_cents(self.subtotal),
+            "tax": from_cents(self.tax),
+            "total": from_cents(self.total),
+        }
+
+
+@dataclass
+class PriceTable:
+    items: Dict[str, ItemPrice]
+    names: Dict[str, str]
+
+    def lookup(self, item: Dict[str, Any]) -> Optional[ItemPrice]:
+        price = self.items.get(item.get("item_id") or "")
+        if price is None and item.get("name"):
+            price = self.items.get(self.names.get(normalize_name(item["name"]), ""))
+        return price
+
+    def price(self, items: Sequence[Dict[str, Any]]) -> Totals:
+        by_rate: Dict[Decimal, int] = defaultdict(int)
+        priced_any = False
+        for item in items:
+            price = self.lookup(item)
+            if price is None:
+                continue
+            unit = price.unit(item.get("size"), item.get("addons") or [])
+            if unit is None:
+                continue
+            priced_any = True
+            try:
+                quantity = int(item.get("quantity") or 0)
+            except (TypeError, ValueError):
+                quantity = 0
+            by_rate[price.tax_rate] += unit * quantity
+
+        if not priced_any:
+            return Totals(None, None, None)
+
+        subtotal = sum(by_rate.values())
+        tax = sum(
+            int((Decimal(amount) * rate).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+            for rate, amount in by_rate.items()
+        )
+        return Totals(subtotal, tax, subtotal + tax)
+
+
+def _price_map(item: Dict[str, Any], key: str) -> Dict[str, int]:
+    prices: Dict[str, int] = {}
+    for name, value in (item.get(key) or {}).items():
+        cents = to_cents(value)
+        if cents is None:
+            raise MenuError(f"Invalid {key} entry {name!r} for item {item.get('id')}")
+        prices[normalize_name(name)] = cents
+    return prices
+
+
+def compile_prices(index: MenuIndex) -> PriceTable:
+    menu_rate = _tax_rate(index.menu.get("tax_rate"))
+    default_rate = menu_rate if menu_rate is not None else Decimal(str(settings.tax_rate))
+    items: Dict[str, ItemPrice] = {}
+    for category in index.menu.get("categories", []):
+        category_rate = _tax_rate(category.get("tax_rate"))
+        for item in category.get("items", []):
+            item_id = item.get("id")
+            if not item_id:
+                continue
+            item_rate = _tax_rate(item.get("tax_rate"))
+            if item_rate is None:
+                item_rate = category_rate if category_rate is not None else default_rate
+            items[item_id] = ItemPrice(
+                base=to_cents(item.get("price")),
+                tax_rate=item_rate,
+                variants=_price_map(item, "variant_prices"),
+                addons=_price_map(item, "addon_prices"),
+            )
+
+    names: Dict[str, str] = {}
+    for key, item in index.aliases.items():
+        names[key] = item.get("id")
+    for key, item in index.by_name.items():
+        names[key] = item.get("id")
+    return PriceTable(items=items, names=names)
+
+
+def price_table(index: MenuIndex) -> PriceTable:
+    table = index.derived.get("price_table")
+    if table is None:
+        table = compile_prices(index)
+        index.derived["price_table"] = table
+    return table
+
+
+def price_items(
+    items: List[Dict[str, Any]],
+    menu: Union[Dict[str, Any], MenuIndex],
+) -> Dict[str, Optional[float]]:
+    return price_table(ensure_menu_index(menu)).price(items).as_dict()
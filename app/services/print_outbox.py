@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Order, PrintJob
+from app.schemas import Order as OrderSchema
+from app.services.order_events import order_events
+from app.services.printer_escpos import print_order
+from app.utils.metrics import PRINT_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+def add_print_job(db: Session, order: OrderSchema) -> PrintJob:
+    job = PrintJob(order_id=order.order_id, payload=order.model_dump(mode="json"))
+    db.add(job)
+    return job
+
+
+def enqueue_print_job(db: Session, order: OrderSchema) -> PrintJob:
+    job = add_print_job(db, order)
+    db.commit()
+    print_worker.wake()
+    return job
+
+
+def retry_delay(attempts: int) -> float:
+    delay = settings.print_retry_base_seconds * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.print_retry_max_seconds)
+
+
+class PrintWorker:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self.recover()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def recover(self) -> int:
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(PrintJob).where(PrintJob.status == "printing").values(status="pending")
+            )
+            db.commit()
+            if result.rowcount:
+                logger.warning("Requeued %s interrupted print jobs", result.rowcount)
+            return result.rowcount
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await asyncio.to_thread(self.drain_once)
+            except Exception as exc:
+                logger.error("Print worker iteration failed: %s", exc)
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.print_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def drain_once(self, limit: int = 20) -> int:
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            jobs = (
+                db.query(PrintJob)
+                .filter(PrintJob.status == "pending", PrintJob.next_attempt_at <= now)
+                .order_by(PrintJob.id)
+                .limit(limit)
+                .all()
+            )
+            processed = 0
+            for job in jobs:
+                if self._claim(db, job):
+                    self._process(db, job)
+                    processed += 1
+            return processed
+        finally:
+            db.close()
+
+    def _claim(self, db: Session, job: PrintJob) -> bool:
+        result = db.execute(
+            update(PrintJob)
+            .where(PrintJob.id == job.id, PrintJob.status == "pending")
+            .values(status="printing", updated_at=datetime.utcnow())
+        )
+        db.commit()
+        db.refresh(job)
+        return result.rowcount == 1
+
+    def _process(self, db: Session, job: PrintJob) -> None:
+        order = db.query(Order).filter(Order.id == job.order_id).first()
+        previous_status = order.status if order else None
+        job.attempts += 1
+        try:
+            print_order(OrderSchema(**job.payload))
+        except Exception as exc:
+            job.last_error = str(exc)
+            PRINT_JOBS.labels(result="error").inc()
+            if job.attempts >= settings.print_max_attempts:
+                job.status = "failed"
+                if order:
+                    order.status = "print_failed"
+                logger.error("Print job %s for order %s failed permanently: %s", job.id, job.order_id, exc)
+            else:
+                job.status = "pending"
+                job.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+                logger.warning(
+                    "Print job %s for order %s failed (attempt %s): %s",
+                    job.id,
+                    job.order_id,
+                    job.attempts,
+                    exc,
+                )
+        else:
+            job.status = "done"
+            job.last_error = None
+            PRINT_JOBS.labels(result="printed").inc()
+            if order:
+                order.status = "printed"
+        db.commit()
+        if order and order.status != previous_status:
+            order_events.publish_order(order)
+
+
+print_worker = PrintWorker()
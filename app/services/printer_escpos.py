@@ -1,51 +1,178 @@
 from __future__ import annotations
 
 import logging
+import socket
+import threading
+import time
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.config import settings
 from app.schemas import Order
+from app.services.tenants import tenant_registry
 from app.utils.formatting import format_ticket
+from app.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
 
+class PrinterError(RuntimeError):
+    pass
+
+
 def _ensure_print_dir() -> Path:
     path = Path("./data/prints")
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
+def _socket_alive(sock: socket.socket) -> bool:
+    try:
+        if sock.fileno() < 0:
+            return False
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return sock.recv(1, socket.MSG_PEEK) != b""
+        except BlockingIOError:
+            return True
+        finally:
+            sock.settimeout(timeout)
+    except OSError:
+        return False
+
+
+class PrinterConnection:
+    def __init__(self, name: str, factory: Callable[[], Any]) -> None:
+        self.name = name
+        self.factory = factory
+        self._printer: Optional[Any] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, tickets: List[str]) -> None:
+        with self._lock:
+            sent = 0
+            for attempt in range(2):
+                try:
+                    printer = self._acquire()
+                    for ticket in tickets[sent:]:
+                        printer.text(ticket + "\n")
+                        printer.cut()
+                        sent += 1
+                    self._last_used = time.monotonic()
+                    return
+                except Exception as exc:
+                    logger.warning("Printer %s write failed (attempt %s): %s", self.name, attempt + 1, exc)
+                    self._discard()
+                    if attempt:
+                        raise PrinterError(f"Printer {self.name} unavailable: {exc}") from exc
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+    def _acquire(self) -> Any:
+        if self._printer is not None and not self._healthy():
+            logger.info("Reconnecting to printer %s", self.name)
+            self._discard()
+        if self._printer is None:
+            printer = self.factory()
+            printer.open()
+            self._printer = printer
+            self._last_used = time.monotonic()
+        return self._printer
+
+    def _healthy(self) -> bool:
+        if time.monotonic() - self._last_used > settings.printer_max_idle_seconds:
+            return False
+        device = getattr(self._printer, "_device", None)
+        if isinstance(device, socket.socket):
+            return _socket_alive(device)
+        return bool(device)
+
+    def _discard(self) -> None:
+        if self._printer is None:
+            return
+        printer, self._printer = self._printer, None
+        try:
+            printer.close()
+        except Exception as exc:
+            logger.debug("Closing printer %s failed: %s", self.name, exc)
+
+
+class PrinterManager:
+    def __init__(self) -> None:
+        self._connections: Dict[Tuple[Any, ...], PrinterConnection] = {}
+        self._lock = threading.Lock()
+
+    def connection(self) -> PrinterConnection:
+        key, name, factory = self._configured_printer()
+        with self._lock:
+            connection = self._connections.get(key)
+            if connection is None:
+                connection = PrinterConnection(name, factory)
+                self._connections[key] = connection
+            return connection
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+
+    def _configured_printer(self) -> Tuple[Tuple[Any, ...], str, Callable[[], Any]]:
+        try:
+            from escpos.printer import Network, Usb
+        except ImportError as exc:
+            raise PrinterError(f"python-escpos is not installed: {exc}") from exc
+
+        mode = settings.printer_mode.lower()
+        if mode == "usb":
+            vendor_id, product_id = settings.printer_usb_vendor_id, settings.printer_usb_product_id
+            if vendor_id is None or product_id is None:
+                raise PrinterError("USB printer IDs are not configured")
+            name = f"usb:{vendor_id:04x}:{product_id:04x}"
+            return ("usb", vendor_id, product_id), name, lambda: Usb(vendor_id, product_id)
+        if mode == "network":
+            host, port = settings.printer_network_host, settings.printer_network_port
+            if not host:
+                raise PrinterError("Network printer host is not configured")
+            timeout = settings.printer_timeout_seconds
+            return ("network", host, port), f"{host}:{port}", lambda: Network(host, port=port, timeout=timeout)
+        raise PrinterError(f"Unsupported printer mode: {settings.printer_mode}")
+
+
+printer_manager = PrinterManager()
+
+
 def print_order(order: Order) -> None:
-    ticket = format_ticket(order)
-    mode = settings.printer_mode.lower()
+    print_orders([order])
 
-    if mode == "dryrun":
-        path = _ensure_print_dir() / f"order_{order.order_id}.txt"
-        path.write_text(ticket)
-        logger.info("Dry-run print saved to %s", path)
-        return
 
-    try:
-        from escpos.printer import Network, Usb
-    except ImportError as exc:
-        logger.error("python-escpos is not installed: %s", exc)
+def print_orders(orders: List[Order]) -> None:
+    if not orders:
         return
+    with timed("print"):
+        _print_tickets(orders)
 
-    if mode == "usb":
-        if settings.printer_usb_vendor_id is None or settings.printer_usb_product_id is None:
-            logger.error("USB printer IDs are not configured")
-            return
-        printer = Usb(settings.printer_usb_vendor_id, settings.printer_usb_product_id)
-    elif mode == "network":
-        if not settings.printer_network_host:
-            logger.error("Network printer host is not configured")
-            return
-        printer = Network(settings.printer_network_host, port=settings.printer_network_port)
-    else:
-        logger.error("Unsupported printer mode: %s", settings.printer_mode)
+
+def _ticket(order: Order) -> str:
+    return format_ticket(order, tenant_registry.get(order.tenant_id).name)
+
+
+def _print_tickets(orders: List[Order]) -> None:
+    mode = settings.printer_mode.lower()
+
+    if mode == "dryrun":
+        print_dir = _ensure_print_dir()
+        for order in orders:
+            path = print_dir / f"order_{order.order_id}.txt"
+            path.write_text(_ticket(order))
+            logger.info("Dry-run print saved to %s", path)
         return
 
-    printer.text(ticket + "\n")
-    printer.cut()
-    logger.info("Order %s printed", order.order_id)
+    connection = printer_manager.connection()
+    connection.send([_ticket(order) for order in orders])
+    logger.info("Printed %s ticket(s) on %s", len(orders), connection.name)
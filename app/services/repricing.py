@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models import Order
+from app.services.analytics import record_revenue_change
+from app.services.menu import MenuIndex
+from app.services.pricing import price_table
+
+REPRICE_BATCH_SIZE = 500
+
+
+def reprice_orders(
+    session_factory: Callable[[], Session],
+    index: MenuIndex,
+    tenant_ids: Optional[Sequence[Optional[str]]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    dry_run: bool = False,
+    batch_size: int = REPRICE_BATCH_SIZE,
+) -> Dict[str, int]:
+    table = price_table(index)
+    scanned = changed = 0
+    last_id = ""
+    while True:
+        db = session_factory()
+        try:
+            query = db.query(Order).filter(Order.id > last_id)
+            if tenant_ids is not None:
+                known = [tenant_id for tenant_id in tenant_ids if tenant_id is not None]
+                clauses = [Order.tenant_id.in_(known)]
+                if None in tenant_ids:
+                    clauses.append(Order.tenant_id.is_(None))
+                query = query.filter(or_(*clauses))
+            if since:
+                query = query.filter(Order.timestamp >= since)
+            if until:
+                query = query.filter(Order.timestamp < until)
+            orders = query.order_by(Order.id).limit(batch_size).all()
+            if not orders:
+                return {"scanned": scanned, "changed": changed}
+
+            for order in orders:
+                previous_total = order.total
+                totals = table.price(order.items or []).as_dict()
+                if (order.subtotal, order.tax, order.total) != (
+                    totals["subtotal"],
+                    totals["tax"],
+                    totals["total"],
+                ):
+                    changed += 1
+                    if not dry_run:
+                        order.subtotal = totals["subtotal"]
+                        order.tax = totals["tax"]
+                        order.total = totals["total"]
+                        record_revenue_change(db, order, previous_total)
+            if not dry_run:
+                db.commit()
+            scanned += len(orders)
+            last_id = orders[-1].id
+        finally:
+            db.close()
+
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import GroupCommitter, SessionLocal, group_committer
+from app.models import CallSession
+from app.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+ENDED_STATUSES = {"completed", "fallback", "abandoned"}
+
+
+@dataclass
+class LiveSession:
+    id: str
+    caller_phone: str = ""
+    transcript: str = ""
+    order_state: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+    llm_failures: int = 0
+    status: str = "in_progress"
+    tenant_id: Optional[str] = None
+    menu_version: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    dirty: bool = field(default=False, repr=False)
+
+    @classmethod
+    def from_model(cls, model: CallSession) -> "LiveSession":
+        return cls(
+            id=model.id,
+            caller_phone=model.caller_phone or "",
+            transcript=model.transcript or "",
+            order_state=model.order_state,
+            attempts=model.attempts or 0,
+            llm_failures=model.llm_failures or 0,
+            status=model.status,
+            tenant_id=model.tenant_id,
+            menu_version=model.menu_version,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "caller_phone": self.caller_phone,
+            "transcript": self.transcript,
+            "order_state": copy.deepcopy(self.order_state),
+            "attempts": self.attempts,
+            "llm_failures": self.llm_failures,
+            "status": self.status,
+            "tenant_id": self.tenant_id,
+            "menu_version": self.menu_version,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class SessionStore:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        committer: Optional[GroupCommitter] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.committer = committer or GroupCommitter(session_factory)
+        self._sessions: Dict[str, LiveSession] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_or_create(
+        self,
+        session_id: str,
+        caller_phone: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> LiveSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            with timed("session_load"):
+                session = self._load(session_id)
+            with self._lock:
+                session = self._sessions.setdefault(session_id, session)
+        changed = False
+        if caller_phone and not session.caller_phone:
+            session.caller_phone = caller_phone
+            changed = True
+        if tenant_id and not session.tenant_id:
+            session.tenant_id = tenant_id
+            changed = True
+        if changed:
+            self.save(session)
+        return session
+
+    def save(self, session: LiveSession) -> None:
+        session.updated_at = datetime.utcnow()
+        session.dirty = True
+
+    def finish(self, session: LiveSession) -> None:
+        self.save(session)
+        self.wake()
+
+    def cached(self, session_id: str) -> Optional[LiveSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def _load(self, session_id: str) -> LiveSession:
+        db = self.session_factory()
+        try:
+            model = db.query(CallSession).filter(CallSession.id == session_id).first()
+        finally:
+            db.close()
+        if model is not None:
+            return LiveSession.from_model(model)
+        return LiveSession(id=session_id, dirty=True)
+
+    def flush(self) -> int:
+        with self._lock:
+            dirty = [session for session in self._sessions.values() if session.dirty]
+            rows: List[Dict[str, Any]] = []
+            for session in dirty:
+                rows.append(session.to_row())
+                session.dirty = False
+        if not rows:
+            self._evict()
+            return 0
+
+        def write(db: Session) -> None:
+            for row in rows:
+                db.merge(CallSession(**row))
+
+        try:
+            with timed("session_flush"):
+                self.committer.run(write)
+        except Exception:
+            with self._lock:
+                for session in dirty:
+                    session.dirty = True
+            raise
+        self._evict()
+        return len(rows)
+
+    def _evict(self) -> None:
+        idle_cutoff = datetime.utcnow() - timedelta(seconds=settings.session_idle_seconds)
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                if session.dirty:
+                    continue
+                if session.status in ENDED_STATUSES or session.updated_at < idle_cutoff:
+                    del self._sessions[session_id]
+
+    def wake(self) -> None:
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.session_flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as exc:
+                logger.error("Session flush failed: %s", exc)
+
+
+session_store = SessionStore(committer=group_committer)
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import io
 import logging
-from typing import Optional
+from array import array
+from collections import deque
+from typing import Deque, Iterable, Optional, Protocol
 
 import requests
 
 from app.config import settings
+from app.services.audio import SAMPLE_RATE, wav_bytes
+from app.services.llm_client import get_audio_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +20,6 @@ def transcribe_audio(audio_url: str) -> Optional[str]:
         logger.warning("OPENAI_API_KEY missing, skipping transcription")
         return None
 
-    try:
-        from openai import OpenAI
-    except ImportError as exc:
-        logger.error("openai package missing: %s", exc)
-        return None
-
     try:
         response = requests.get(audio_url, timeout=15)
         response.raise_for_status()
@@ -29,10 +27,23 @@ def transcribe_audio(audio_url: str) -> Optional[str]:
         logger.error("Failed to download audio: %s", exc)
         return None
 
-    audio_bytes = io.BytesIO(response.content)
-    audio_bytes.name = "audio.wav"
+    return _whisper(response.content, "audio.wav")
+
+
+def _whisper(audio: bytes, filename: str) -> Optional[str]:
+    if not settings.openai_api_key:
+        logger.warning("OPENAI_API_KEY missing, skipping transcription")
+        return None
+
+    try:
+        client = get_audio_client()
+    except RuntimeError as exc:
+        logger.error("OpenAI transcription unavailable: %s", exc)
+        return None
+
+    audio_bytes = io.BytesIO(audio)
+    audio_bytes.name = filename
 
-    client = OpenAI(api_key=settings.openai_api_key)
     try:
         result = client.audio.transcriptions.create(
             model="whisper-1",
@@ -43,3 +54,32 @@ def transcribe_audio(audio_url: str) -> Optional[str]:
         return None
 
     return getattr(result, "text", None)
+
+
+class Transcriber(Protocol):
+    def transcribe(self, samples: array, sample_rate: int = SAMPLE_RATE) -> Optional[str]:
+        ...
+
+
+class WhisperTranscriber:
+    def transcribe(self, samples: array, sample_rate: int = SAMPLE_RATE) -> Optional[str]:
+        return _whisper(wav_bytes(samples, sample_rate), "utterance.wav")
+
+
+class StubTranscriber:
+    def __init__(self, texts: Iterable[str] = ()) -> None:
+        self.texts: Deque[str] = deque(texts)
+
+    def transcribe(self, samples: array, sample_rate: int = SAMPLE_RATE) -> Optional[str]:
+        if not self.texts:
+            return None
+        return self.texts.popleft()
+
+
+def get_transcriber(name: Optional[str] = None) -> Transcriber:
+    name = name or settings.stream_transcriber
+    if name == "whisper":
+        return WhisperTranscriber()
+    if name == "stub":
+        return StubTranscriber()
+    raise ValueError(f"Unknown transcriber: {name}")
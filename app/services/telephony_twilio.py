@@ -1,11 +1,28 @@
 from __future__ import annotations
 
-from twilio.twiml.voice_response import Dial, Gather, VoiceResponse
+from typing import Dict, Optional, Union
+
+from twilio.twiml.voice_response import Connect, Dial, Gather, VoiceResponse
 
 from app.config import settings
+from app.services.tts import tts_cache
+
+NOT_HEARD = "Sorry, I did not hear you."
+TRANSFERRING = "Please hold while I transfer you to a team member."
+CANNOT_TAKE_ORDER = "Sorry, we could not take your order."
+
+FIXED_PROMPTS = (NOT_HEARD, TRANSFERRING, CANNOT_TAKE_ORDER)
+
+
+def speak(verb: Union[VoiceResponse, Gather], text: str, cacheable: bool = True) -> None:
+    audio_url = tts_cache.audio_url(text, render_missing=cacheable)
+    if audio_url:
+        verb.play(audio_url)
+    else:
+        verb.say(text, voice=settings.twilio_voice)
 
 
-def gather_speech(action_url: str, prompt: str | None = None) -> str:
+def gather_speech(action_url: str, prompt: str | None = None, cacheable: bool = True) -> str:
     response = VoiceResponse()
     gather = Gather(
         input="speech",
@@ -16,29 +33,43 @@ def gather_speech(action_url: str, prompt: str | None = None) -> str:
         action_on_empty_result=True,
     )
     if prompt:
-        gather.say(prompt, voice=settings.twilio_voice)
+        speak(gather, prompt, cacheable)
     response.append(gather)
     if not prompt:
-        response.say("Sorry, I did not hear you.", voice=settings.twilio_voice)
+        speak(response, NOT_HEARD)
     return str(response)
 
 
 def say_and_hangup(message: str) -> str:
     response = VoiceResponse()
-    response.say(message, voice=settings.twilio_voice)
+    speak(response, message)
     response.hangup()
     return str(response)
 
 
+def connect_stream(
+    stream_url: str,
+    action_url: str,
+    prompt: str | None = None,
+    parameters: Optional[Dict[str, str]] = None,
+) -> str:
+    response = VoiceResponse()
+    if prompt:
+        speak(response, prompt)
+    connect = Connect(action=action_url, method="POST")
+    stream = connect.stream(url=stream_url)
+    for name, value in (parameters or {}).items():
+        stream.parameter(name=name, value=value)
+    response.append(connect)
+    return str(response)
+
+
 def dial_fallback(number: str) -> str:
     response = VoiceResponse()
     if number:
-        response.say(
-            "Please hold while I transfer you to a team member.",
-            voice=settings.twilio_voice,
-        )
+        speak(response, TRANSFERRING)
         response.append(Dial(number))
     else:
-        response.say("Sorry, we could not take your order.", voice=settings.twilio_voice)
+        speak(response, CANNOT_TAKE_ORDER)
         response.hangup()
     return str(response)
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.llm_order_extractor import prompt_prefix
+from app.services.local_parser import get_grammar
+from app.services.menu import MenuError, MenuIndex, build_menu_index, load_menu
+from app.services.pricing import price_table
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT_ID = "default"
+
+
+class TenantError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Tenant:
+    id: str
+    name: str
+    menu_path: str
+    numbers: Tuple[str, ...] = ()
+
+
+def normalize_number(number: Optional[str]) -> str:
+    return "".join(ch for ch in number or "" if ch.isdigit())
+
+
+def default_tenant() -> Tenant:
+    return Tenant(id=DEFAULT_TENANT_ID, name=settings.restaurant_name, menu_path=settings.menu_path)
+
+
+def build_tenant_index(tenant: Tenant) -> MenuIndex:
+    try:
+        index = build_menu_index(load_menu(tenant.menu_path))
+        price_table(index)
+    except ValueError as exc:
+        raise MenuError(f"Invalid menu for tenant {tenant.id}: {exc}") from exc
+    prompt_prefix(index)
+    get_grammar(index)
+    return index
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_tenants(path: str) -> List[Tenant]:
+    tenants_path = Path(path)
+    if not tenants_path.exists():
+        raise TenantError(f"Tenants file not found: {tenants_path}")
+    data = json.loads(tenants_path.read_text())
+    entries = data.get("tenants") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise TenantError("Tenants file must contain a tenants list")
+
+    tenants: List[Tenant] = []
+    seen_numbers: Dict[str, str] = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("id") or not entry.get("menu_path"):
+            raise TenantError("Each tenant needs an id and a menu_path")
+        numbers = tuple(normalize_number(number) for number in entry.get("numbers") or [])
+        for number in numbers:
+            if number in seen_numbers:
+                raise TenantError(f"Number {number} is assigned to {seen_numbers[number]} and {entry['id']}")
+            seen_numbers[number] = entry["id"]
+        tenants.append(
+            Tenant(
+                id=entry["id"],
+                name=entry.get("name") or settings.restaurant_name,
+                menu_path=entry["menu_path"],
+                numbers=numbers,
+            )
+        )
+    return tenants
+
+
+class TenantRegistry:
+    def __init__(self, tenants: Optional[List[Tenant]] = None, cache_size: Optional[int] = None) -> None:
+        self.cache_size = cache_size if cache_size is not None else settings.menu_cache_size
+        self._menus: "OrderedDict[str, MenuIndex]" = OrderedDict()
+        self._versions: "OrderedDict[Tuple[str, str], MenuIndex]" = OrderedDict()
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self.configure(tenants or [])
+
+    def configure(self, tenants: List[Tenant]) -> None:
+        by_id = {tenant.id: tenant for tenant in tenants}
+        by_id.setdefault(DEFAULT_TENANT_ID, default_tenant())
+        by_number = {number: tenant for tenant in tenants for number in tenant.numbers}
+        with self._lock:
+            self._by_id = by_id
+            self._by_number = by_number
+            self._menus.clear()
+            self._versions.clear()
+            self._mtimes.clear()
+
+    def load(self, path: Optional[str] = None) -> None:
+        path = path if path is not None else settings.tenants_path
+        self.configure(load_tenants(path) if path else [])
+
+    @property
+    def default(self) -> Tenant:
+        return self._by_id[DEFAULT_TENANT_ID]
+
+    def tenants(self) -> List[Tenant]:
+        return list(self._by_id.values())
+
+    def get(self, tenant_id: Optional[str]) -> Tenant:
+        return self._by_id.get(tenant_id or DEFAULT_TENANT_ID) or self.default
+
+    def resolve(self, to_number: Optional[str]) -> Tenant:
+        return self._by_number.get(normalize_number(to_number)) or self.default
+
+    def menu_index(self, tenant: Tenant, version: Optional[str] = None) -> Optional[MenuIndex]:
+        with self._lock:
+            if version:
+                pinned = self._versions.get((tenant.id, version))
+                if pinned is not None:
+                    self._versions.move_to_end((tenant.id, version))
+                    return pinned
+            index = self._menus.get(tenant.id)
+            if index is not None:
+                self._menus.move_to_end(tenant.id)
+                return index
+        try:
+            mtime = _mtime(tenant.menu_path)
+            index = build_tenant_index(tenant)
+        except Exception as exc:
+            logger.error("Failed to load menu for tenant %s: %s", tenant.id, exc)
+            return None
+        with self._lock:
+            current = self._menus.get(tenant.id)
+            if current is not None:
+                return current
+            self._install(tenant, index, mtime)
+        return index
+
+    def reload(self, tenant: Tenant) -> Tuple[MenuIndex, Optional[str]]:
+        mtime = _mtime(tenant.menu_path)
+        index = build_tenant_index(tenant)
+        with self._lock:
+            previous = self._menus.get(tenant.id)
+            if previous is not None and previous.version == index.version:
+                self._mtimes[tenant.id] = mtime
+                return previous, previous.version
+            self._install(tenant, index, mtime)
+        logger.info(
+            "Menu for tenant %s reloaded: %s -> %s",
+            tenant.id,
+            previous.version if previous else None,
+            index.version,
+        )
+        return index, previous.version if previous else None
+
+    def _install(self, tenant: Tenant, index: MenuIndex, mtime: Optional[int]) -> None:
+        self._menus[tenant.id] = index
+        self._menus.move_to_end(tenant.id)
+        self._mtimes[tenant.id] = mtime
+        while len(self._menus) > max(self.cache_size, 1):
+            evicted, _ = self._menus.popitem(last=False)
+            self._mtimes.pop(evicted, None)
+        self._versions[(tenant.id, index.version)] = index
+        self._versions.move_to_end((tenant.id, index.version))
+        while len(self._versions) > max(settings.menu_version_cache_size, self.cache_size):
+            self._versions.popitem(last=False)
+
+    def changed_tenants(self) -> List[Tenant]:
+        with self._lock:
+            loaded = [(self._by_id[tenant_id], mtime) for tenant_id, mtime in self._mtimes.items()]
+        return [tenant for tenant, mtime in loaded if _mtime(tenant.menu_path) != mtime]
+
+    def reload_changed(self) -> List[str]:
+        reloaded = []
+        for tenant in self.changed_tenants():
+            try:
+                self.reload(tenant)
+                reloaded.append(tenant.id)
+            except Exception as exc:
+                logger.error("Menu reload for tenant %s failed, keeping current menu: %s", tenant.id, exc)
+                with self._lock:
+                    self._mtimes[tenant.id] = _mtime(tenant.menu_path)
+        return reloaded
+
+    def cached_tenant_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._menus)
+
+    def current_versions(self) -> Dict[str, str]:
+        with self._lock:
+            return {tenant_id: index.version for tenant_id, index in self._menus.items()}
+
+
+class MenuWatcher:
+    def __init__(self, registry: TenantRegistry) -> None:
+        self.registry = registry
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if settings.menu_watch_interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.menu_watch_interval_seconds)
+            try:
+                await asyncio.to_thread(self.registry.reload_changed)
+            except Exception as exc:
+                logger.error("Menu watcher failed: %s", exc)
+
+
+tenant_registry = TenantRegistry()
+menu_watcher = MenuWatcher(tenant_registry)
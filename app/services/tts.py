@@ -1,34 +1,188 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Set
 
 from app.config import settings
+from app.services.audio import SAMPLE_RATE, downsample, encode_ulaw, pcm16_samples
+from app.services.llm_client import get_audio_client
+from app.utils.metrics import TTS_CACHE
 
 logger = logging.getLogger(__name__)
 
+TTS_ROUTE = "/tts"
+PCM_SAMPLE_RATE = 24000
 
-def synthesize_speech(text: str) -> Optional[bytes]:
+def synthesize_speech(text: str, voice: Optional[str] = None, response_format: str = "mp3") -> Optional[bytes]:
     if not settings.use_openai_tts:
         return None
     if not settings.openai_api_key:
         logger.warning("OPENAI_API_KEY missing, skipping TTS")
         return None
     try:
-        from openai import OpenAI
-    except ImportError as exc:
-        logger.error("openai package missing: %s", exc)
+        client = get_audio_client()
+    except RuntimeError as exc:
+        logger.error("OpenAI TTS unavailable: %s", exc)
         return None
 
-    client = OpenAI(api_key=settings.openai_api_key)
     try:
         response = client.audio.speech.create(
             model=settings.openai_tts_model,
-            voice="alloy",
+            voice=voice or settings.openai_tts_voice,
             input=text,
+            response_format=response_format,
         )
     except Exception as exc:
         logger.error("OpenAI TTS failed: %s", exc)
         return None
 
     return response.content
+
+
+def audio_key(text: str, voice: str, model: str) -> str:
+    digest = hashlib.sha256(f"{model}\0{voice}\0{text}".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class TTSCache:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        synthesize: Callable[..., Optional[bytes]] = synthesize_speech,
+    ) -> None:
+        self.directory = Path(directory or settings.tts_cache_dir)
+        self.synthesize = synthesize
+        self._files: "OrderedDict[str, None]" = OrderedDict()
+        self._scanned = False
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.use_openai_tts
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.mp3"
+
+    def url_for(self, key: str) -> str:
+        return f"{settings.base_url.rstrip('/')}{TTS_ROUTE}/{key}.mp3"
+
+    def audio_url(self, text: str, render_missing: bool = True) -> Optional[str]:
+        if not self.enabled or not text:
+            return None
+        key = audio_key(text, settings.openai_tts_voice, settings.openai_tts_model)
+        if self._cached(f"{key}.mp3"):
+            TTS_CACHE.labels(result="hit").inc()
+            return self.url_for(key)
+        TTS_CACHE.labels(result="miss").inc()
+        if render_missing:
+            self.render_later([text])
+        return None
+
+    def render(self, text: str) -> Optional[str]:
+        voice = settings.openai_tts_voice
+        key = audio_key(text, voice, settings.openai_tts_model)
+        if not self._cached(f"{key}.mp3"):
+            audio = self.synthesize(text, voice)
+            if not audio:
+                return None
+            self._write(self.path_for(key), audio)
+        return self.url_for(key)
+
+    def stream_audio(self, text: str, cache: bool = True) -> Optional[bytes]:
+        if not self.enabled or not text:
+            return None
+        voice = settings.openai_tts_voice
+        path = self.directory / f"{audio_key(text, voice, settings.openai_tts_model)}.ulaw"
+        if self._cached(path.name):
+            try:
+                audio = path.read_bytes()
+            except OSError:
+                audio = None
+            if audio is not None:
+                TTS_CACHE.labels(result="hit").inc()
+                return audio
+        TTS_CACHE.labels(result="miss").inc()
+        pcm = self.synthesize(text, voice, response_format="pcm")
+        if not pcm:
+            return None
+        audio = encode_ulaw(downsample(pcm16_samples(pcm), PCM_SAMPLE_RATE // SAMPLE_RATE))
+        if cache:
+            self._write(path, audio)
+        return audio
+
+    def _scan(self) -> None:
+        if self._scanned:
+            return
+        self._scanned = True
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith((".mp3", ".ulaw"))]
+        except OSError:
+            return
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            self._files[entry.name] = None
+
+    def _cached(self, name: str) -> bool:
+        with self._lock:
+            self._scan()
+            if name not in self._files:
+                if not (self.directory / name).exists():
+                    return False
+                self._files[name] = None
+            self._files.move_to_end(name)
+            return True
+
+    def _write(self, path: Path, audio: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(audio)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._scan()
+            self._files[path.name] = None
+            self._files.move_to_end(path.name)
+            while len(self._files) > max(settings.tts_cache_max_files, 1):
+                evicted, _ = self._files.popitem(last=False)
+                try:
+                    (self.directory / evicted).unlink()
+                except OSError:
+                    pass
+
+    def render_later(self, texts: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        for text in texts:
+            with self._lock:
+                if text in self._pending:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts")
+                self._pending.add(text)
+                self._executor.submit(self._render_pending, text)
+
+    def _render_pending(self, text: str) -> None:
+        try:
+            self.render(text)
+            if settings.media_streams_enabled:
+                self.stream_audio(text)
+        except Exception as exc:
+            logger.error("TTS render failed: %s", exc)
+        finally:
+            with self._lock:
+                self._pending.discard(text)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+tts_cache = TTSCache()
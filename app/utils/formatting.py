@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable
+from datetime import datetime, timezone
+from typing import Iterable, Optional
 
 from app.config import settings
 from app.schemas import Order
@@ -37,11 +37,11 @@ def format_order_summary(order: Order) -> str:
     return "; ".join(parts)
 
 
-def format_ticket(order: Order) -> str:
+def format_ticket(order: Order, restaurant_name: Optional[str] = None) -> str:
     order_time = order.timestamp.strftime("%Y-%m-%d %H:%M")
     short_id = order.order_id.split("-")[0]
     lines = [
-        settings.restaurant_name,
+        restaurant_name or settings.restaurant_name,
         "-" * 32,
         f"Time: {order_time}",
         f"Order: {short_id}",
@@ -76,3 +76,9 @@ def format_ticket(order: Order) -> str:
 
 def now_utc() -> datetime:
     return datetime.utcnow()
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = Histogram(
+    "takeaway_stage_seconds",
+    "Time spent in each stage of a call turn",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+WEBHOOK_SECONDS = Histogram(
+    "takeaway_webhook_seconds",
+    "Twilio webhook latency",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTRACTIONS = Counter("takeaway_extractions_total", "Order extraction turns by source", ["source"])
+LLM_RETRIES = Counter("takeaway_llm_retries_total", "LLM calls retried after a failure")
+LLM_FAILURES = Counter("takeaway_llm_failures_total", "Turns where every LLM attempt failed")
+FALLBACKS = Counter("takeaway_fallbacks_total", "Calls forwarded to staff")
+CLARIFICATIONS = Counter("takeaway_clarification_turns_total", "Turns that ended with a follow-up question")
+EXTRACTION_CACHE = Counter("takeaway_extraction_cache_total", "Extraction cache lookups by result", ["result"])
+TTS_CACHE = Counter("takeaway_tts_cache_total", "Prompt audio cache lookups by result", ["result"])
+PRINT_JOBS = Counter("takeaway_print_jobs_total", "Print job attempts by result", ["result"])
+
+_stage_children: Dict[str, Histogram] = {}
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    child = _stage_children.get(stage)
+    if child is None:
+        child = _stage_children.setdefault(stage, STAGE_SECONDS.labels(stage=stage))
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        child.observe(time.perf_counter() - started)
+
+
+def render_metrics() -> bytes:
+    return generate_latest()
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.scenarios import CONVERSATIONS
+
+
+@dataclass
+class LoadReport:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: int = 0
+    requests: int = 0
+    calls: int = 0
+    completed: int = 0
+    fallbacks: int = 0
+    abandoned: int = 0
+    elapsed: float = 0.0
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.requests += 1
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors += 1
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _form(call_sid: str, caller: str, speech: Optional[str] = None) -> Dict[str, str]:
+    data = {
+        "AccountSid": "AC00000000000000000000000000000000",
+        "CallSid": call_sid,
+        "From": caller,
+        "To": "+15550000000",
+        "CallStatus": "in-progress",
+        "Direction": "inbound",
+    }
+    if speech is not None:
+        data["SpeechResult"] = speech
+        data["Confidence"] = "0.92"
+    return data
+
+
+async def _post(client: httpx.AsyncClient, report: LoadReport, path: str, data: Dict[str, str]) -> str:
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, data=data)
+    except httpx.HTTPError:
+        report.record(path, time.perf_counter() - started, False)
+        return ""
+    report.record(path, time.perf_counter() - started, response.status_code == 200)
+    return response.text if response.status_code == 200 else ""
+
+
+async def simulate_call(client: httpx.AsyncClient, report: LoadReport, script: List[str], think_time: float) -> None:
+    call_sid = f"CA{uuid.uuid4().hex}"
+    caller = f"+1555{random.randint(0, 9999999):07d}"
+    report.calls += 1
+
+    twiml = await _post(client, report, "/twilio/voice", _form(call_sid, caller))
+    for utterance in script:
+        if not twiml:
+            break
+        await asyncio.sleep(think_time)
+        twiml = await _post(client, report, "/twilio/process", _form(call_sid, caller, utterance))
+        if "<Dial" in twiml or "<Hangup" in twiml:
+            report.fallbacks += 1
+            return
+        if "/twilio/confirm" in twiml:
+            await asyncio.sleep(think_time)
+            twiml = await _post(client, report, "/twilio/confirm", _form(call_sid, caller, "yes"))
+            if "order is placed" in twiml:
+                report.completed += 1
+                return
+            break
+    report.abandoned += 1
+
+
+async def run_load(
+    base_url: str,
+    calls: int,
+    concurrency: int,
+    think_time: float,
+    timeout: float,
+) -> LoadReport:
+    report = LoadReport()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def one(position: int) -> None:
+            async with semaphore:
+                await simulate_call(client, report, CONVERSATIONS[position % len(CONVERSATIONS)], think_time)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(position) for position in range(calls)))
+        report.elapsed = time.perf_counter() - started
+    return report
+
+
+def format_report(report: LoadReport, concurrency: int) -> str:
+    lines = [
+        f"Concurrent calls: {concurrency}",
+        f"Calls: {report.calls}  completed: {report.completed}  fallback: {report.fallbacks}  "
+        f"abandoned: {report.abandoned}",
+        f"Requests: {report.requests}  errors: {report.errors} "
+        f"({100 * report.errors / max(report.requests, 1):.1f}%)",
+        f"Elapsed: {report.elapsed:.2f}s  throughput: {report.requests / max(report.elapsed, 1e-9):.1f} req/s, "
+        f"{report.calls / max(report.elapsed, 1e-9):.2f} calls/s",
+        f"Fallback rate: {100 * report.fallbacks / max(report.calls, 1):.1f}%",
+        "",
+        f"{'endpoint':<18}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    all_latencies: List[float] = []
+    for endpoint in sorted(report.latencies):
+        values = report.latencies[endpoint]
+        all_latencies.extend(values)
+        lines.append(_latency_row(endpoint, values))
+    lines.append(_latency_row("all", all_latencies))
+    return "\n".join(lines)
+
+
+def _latency_row(label: str, values: List[float]) -> str:
+    return (
+        f"{label:<18}{len(values):>8}"
+        f"{percentile(values, 50) * 1000:>10.1f}"
+        f"{percentile(values, 95) * 1000:>10.1f}"
+        f"{percentile(values, 99) * 1000:>10.1f}"
+        f"{(max(values) if values else 0.0) * 1000:>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive concurrent scripted calls against the Twilio webhooks")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between caller turns")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.base_url, args.calls, args.concurrency, args.think_time, args.timeout))
+    print(format_report(report, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+CONVERSATIONS: List[List[str]] = [
+    ["two large pepperoni pizzas and fries", "small"],
+    ["a cola", "can"],
+    ["hi could I get a margherita pizza for collection please", "medium"],
+    ["I'd like a chicken burger with spicy mayo and a bottle of lemonade", "double"],
+    ["what do you have for dessert", "one cheesecake slice"],
+]
+
+CANNED_RESPONSES: List[Dict[str, Any]] = [
+    {
+        "match": "margherita pizza for collection",
+        "response": {
+            "changes": [
+                {"op": "set", "field": "order_type", "value": "takeaway"},
+                {"op": "add", "item": {"name": "Margherita Pizza", "quantity": 1}},
+            ],
+            "missing_fields": ["items[0].size"],
+            "question": "What size would you like for the Margherita Pizza?",
+        },
+    },
+    {
+        "match": "chicken burger with spicy mayo",
+        "response": {
+            "changes": [
+                {"op": "add", "item": {"name": "Crispy Chicken Burger", "quantity": 1, "addons": ["spicy mayo"]}},
+                {"op": "add", "item": {"name": "Sparkling Lemonade", "quantity": 1, "size": "bottle"}},
+            ],
+            "missing_fields": ["items[0].size"],
+            "question": "Single or double for the burger?",
+        },
+    },
+    {
+        "match": "dessert",
+        "response": {
+            "changes": [],
+            "missing_fields": ["items"],
+            "question": "We have a Chocolate Brownie and New York Cheesecake. Which would you like?",
+        },
+    },
+    {
+        "match": "cheesecake slice",
+        "response": {
+            "changes": [{"op": "add", "item": {"name": "New York Cheesecake", "quantity": 1, "size": "slice"}}],
+            "missing_fields": [],
+            "question": None,
+        },
+    },
+]
+
+DEFAULT_RESPONSE: Dict[str, Any] = {
+    "changes": [],
+    "missing_fields": ["items"],
+    "question": "What would you like to order?",
+}
+
+
+def canned_response(transcript: str) -> Dict[str, Any]:
+    lowered = transcript.lower()
+    for entry in CANNED_RESPONSES:
+        if entry["match"] in lowered:
+            return entry["response"]
+    return DEFAULT_RESPONSE
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from loadtest.scenarios import canned_response
+
+app = FastAPI(title="Stub LLM")
+app.state.latency_ms = 800.0
+app.state.jitter_ms = 200.0
+app.state.error_rate = 0.0
+app.state.chunk_ms = 20.0
+
+CHUNK_CHARS = 12
+
+
+def _caller_text(body: Dict[str, Any]) -> str:
+    for message in reversed(body.get("messages") or []):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content") or ""
+        for line in content.splitlines():
+            if line.startswith("Caller said:"):
+                return line[len("Caller said:"):].strip()
+        return content
+    return ""
+
+
+def completion_payload(body: Dict[str, Any]) -> Dict[str, Any]:
+    content = json.dumps(canned_response(_caller_text(body)))
+    prompt_chars = sum(len(message.get("content") or "") for message in body.get("messages") or [])
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (prompt_chars + len(content)) // 4,
+        },
+    }
+
+
+def stream_chunks(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    payload = completion_payload(body)
+    content = payload["choices"][0]["message"]["content"]
+    base = {
+        "id": payload["id"],
+        "object": "chat.completion.chunk",
+        "created": payload["created"],
+        "model": payload["model"],
+    }
+    chunks = []
+    for start in range(0, len(content), CHUNK_CHARS):
+        delta = {"content": content[start:start + CHUNK_CHARS]}
+        chunks.append({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+    chunks.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    if (body.get("stream_options") or {}).get("include_usage"):
+        chunks.append({**base, "choices": [], "usage": payload["usage"]})
+    return chunks
+
+
+async def _sse(chunks: List[Dict[str, Any]]) -> AsyncIterator[str]:
+    for chunk in chunks:
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(app.state.chunk_ms / 1000)
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request) -> Response:
+    body = await request.json()
+    delay = max(app.state.latency_ms + random.uniform(-app.state.jitter_ms, app.state.jitter_ms), 0.0)
+    await asyncio.sleep(delay / 1000)
+    if random.random() < app.state.error_rate:
+        return JSONResponse({"error": {"message": "stub failure", "type": "server_error"}}, status_code=500)
+    if body.get("stream"):
+        return StreamingResponse(_sse(stream_chunks(body)), media_type="text/event-stream")
+    return JSONResponse(completion_payload(body))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub LLM server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    app.state.latency_ms = args.latency_ms
+    app.state.jitter_ms = args.jitter_ms
+    app.state.error_rate = args.error_rate
+    app.state.chunk_ms = args.chunk_ms
+
+    import uvicorn
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
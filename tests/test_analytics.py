@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+from app.api.routes_calls import _save_order
+from app.models import SalesRollup
+from app.schemas import Order as OrderSchema
+from app.services.analytics import rebuild_rollups, sales_summary
+
+
+def _order(order_id, timestamp, items, total, order_type="takeaway", tenant_id=None):
+    return OrderSchema(
+        order_id=order_id,
+        timestamp=timestamp,
+        caller_phone="+15550000000",
+        order_type=order_type,
+        items=items,
+        total=total,
+        status="confirmed",
+        tenant_id=tenant_id,
+    )
+
+
+PIZZA = {"item_id": "margherita", "name": "Margherita Pizza", "quantity": 2, "size": "large"}
+COLA = {"item_id": "cola", "name": "Cola", "quantity": 1}
+
+
+def _seed(factory):
+    db = factory()
+    _save_order(db, _order("a", datetime(2024, 1, 1, 18, 5), [PIZZA, COLA], 27.0))
+    _save_order(db, _order("b", datetime(2024, 1, 1, 18, 40), [COLA], 2.0, "delivery"))
+    _save_order(db, _order("c", datetime(2024, 1, 1, 19, 10), [PIZZA], 25.0))
+    _save_order(db, _order("d", datetime(2024, 1, 1, 19, 15), [COLA], 2.0, tenant_id="burgers"))
+    db.commit()
+    db.close()
+
+
+def _snapshot(factory):
+    db = factory()
+    try:
+        return sorted(
+            (row.tenant_id, row.period, row.bucket, row.dimension, row.key, row.orders, row.quantity, row.revenue_cents)
+            for row in db.query(SalesRollup)
+        )
+    finally:
+        db.close()
+
+
+def test_saving_orders_updates_rollups_and_backfill_matches(session_factory):
+    _seed(session_factory)
+    incremental = _snapshot(session_factory)
+
+    assert ("default", "day", datetime(2024, 1, 1), "total", "", 3, 6, 5400) in incremental
+    assert ("default", "hour", datetime(2024, 1, 1, 18), "item", "cola", 2, 2, 0) in incremental
+    assert ("burgers", "day", datetime(2024, 1, 1), "order_type", "takeaway", 1, 1, 200) in incremental
+
+    assert rebuild_rollups(session_factory) == 4
+    assert _snapshot(session_factory) == incremental
+
+
+def test_sales_summary_converts_aware_bounds_to_utc(session_factory):
+    _seed(session_factory)
+    plus_two = timezone(timedelta(hours=2))
+    db = session_factory()
+    aware = sales_summary(
+        db,
+        "hour",
+        datetime(2024, 1, 1, 20, 30, tzinfo=plus_two),
+        datetime(2024, 1, 1, 21, 0, tzinfo=plus_two),
+    )
+    naive = sales_summary(db, "hour", datetime(2024, 1, 1, 18, 30), datetime(2024, 1, 1, 19, 0))
+    db.close()
+
+    assert aware == naive
+    assert aware.since == datetime(2024, 1, 1, 18)
+    assert aware.orders == 2
+
+
+def test_analytics_endpoint_answers_from_rollups(session_factory, api_client):
+    _seed(session_factory)
+    response = api_client.get(
+        "/api/analytics",
+        params={"period": "hour", "since": "2024-01-01T18:30:00", "until": "2024-01-02T00:00:00", "tenant_id": "default"},
+    )
+    invalid = api_client.get("/api/analytics", params={"period": "week"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["orders"] == 3
+    assert body["revenue"] == 54.0
+    assert [bucket["orders"] for bucket in body["buckets"]] == [2, 1]
+    assert body["items"][0] == {"key": "margherita", "orders": 2, "quantity": 4, "revenue": None}
+    assert {row["key"]: row["orders"] for row in body["order_types"]} == {"takeaway": 2, "delivery": 1}
+    assert invalid.status_code == 422
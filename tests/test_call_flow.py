@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api import routes_calls
+from app.main import app
+from app.services.session_store import SessionStore
+from app.services.tenants import TenantRegistry, load_tenants
+
+
+def test_rejected_order_is_replaced_when_the_caller_restates_it(session_factory, monkeypatch):
+    monkeypatch.setattr(routes_calls, "session_store", SessionStore(session_factory))
+    client = TestClient(app)
+    client.post("/twilio/voice", data={"CallSid": "CA1", "From": "+15550001111"})
+
+    first = client.post(
+        "/twilio/process",
+        data={"CallSid": "CA1", "SpeechResult": "two large pepperoni pizzas and a large fries"},
+    )
+    assert "2x Pepperoni Pizza (large)" in first.text
+
+    rejected = client.post("/twilio/confirm", data={"CallSid": "CA1", "SpeechResult": "no"})
+    assert routes_calls.REPEAT_ORDER in rejected.text
+
+    second = client.post(
+        "/twilio/process",
+        data={"CallSid": "CA1", "SpeechResult": "one large pepperoni pizza and a large fries"},
+    )
+    assert "You ordered 1x Pepperoni Pizza (large); 1x Seasoned Fries (large). Is that correct?" in second.text
+
+
+def test_confirming_without_a_loaded_menu_hangs_up(session_factory, tmp_path, monkeypatch):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps({"tenants": [
+        {"id": "broken", "menu_path": str(tmp_path / "missing.json"), "numbers": ["+15550003333"]},
+    ]}))
+    store = SessionStore(session_factory)
+    monkeypatch.setattr(routes_calls, "session_store", store)
+    monkeypatch.setattr(routes_calls, "tenant_registry", TenantRegistry(load_tenants(str(path))))
+    session = store.get_or_create("CA2", "+15550001111", "broken")
+    session.order_state = {"items": [{"item_id": "cola", "name": "Cola", "quantity": 1}]}
+
+    response = TestClient(app).post(
+        "/twilio/confirm",
+        data={"CallSid": "CA2", "To": "+15550003333", "SpeechResult": "yes"},
+    )
+    assert response.status_code == 200
+    assert routes_calls.MENU_UNAVAILABLE in response.text
+    assert store.cached("CA2").status != "completed"
+
+
+def test_process_webhook_loads_call_context_off_the_event_loop(session_factory, monkeypatch):
+    monkeypatch.setattr(routes_calls, "session_store", SessionStore(session_factory))
+    original = routes_calls.call_context
+    on_loop = []
+
+    def call_context(*args):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return original(*args)
+
+    monkeypatch.setattr(routes_calls, "call_context", call_context)
+    response = TestClient(app).post("/twilio/process", data={"CallSid": "CA3", "SpeechResult": "two cokes"})
+    assert response.status_code == 200
+    assert on_loop == [False]
@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.db import Base, GroupCommitter, add_missing_columns, apply_sqlite_pragmas
+from app.models import CallSession
+
+
+def test_sqlite_pragmas_enable_wal(tmp_path):
+    connection = sqlite3.connect(tmp_path / "test.db")
+    apply_sqlite_pragmas(connection)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert connection.execute("PRAGMA busy_timeout").fetchone()[0] == settings.sqlite_busy_timeout_ms
+    connection.close()
+
+
+def _committer(engine):
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    return GroupCommitter(factory), factory, commits
+
+
+def test_concurrent_writes_share_commits(engine, monkeypatch):
+    monkeypatch.setattr(settings, "group_commit_window_ms", 50.0)
+    committer, factory, commits = _committer(engine)
+    barrier = threading.Barrier(8)
+
+    def writer(n):
+        barrier.wait()
+        committer.run(lambda db: db.add(CallSession(id=f"CA{n}")))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    committer.stop()
+
+    assert factory().query(CallSession).count() == 8
+    assert len(commits) < 8
+
+
+def test_failing_write_does_not_lose_the_rest_of_the_batch(engine, monkeypatch):
+    monkeypatch.setattr(settings, "group_commit_window_ms", 50.0)
+    committer, factory, _ = _committer(engine)
+    barrier = threading.Barrier(3)
+    errors = []
+
+    def good(n):
+        barrier.wait()
+        committer.run(lambda db: db.add(CallSession(id=f"ok{n}")))
+
+    def bad():
+        barrier.wait()
+
+        def work(db):
+            raise ValueError("boom")
+
+        try:
+            committer.run(work)
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=good, args=(n,)) for n in range(2)] + [threading.Thread(target=bad)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    committer.stop()
+
+    assert len(errors) == 1
+    assert factory().query(CallSession).count() == 2
+
+
+def test_group_commit_can_be_disabled(engine, monkeypatch):
+    monkeypatch.setattr(settings, "group_commit_enabled", False)
+    committer, factory, commits = _committer(engine)
+    assert committer.run(lambda db: db.add(CallSession(id="solo"))) is None
+    assert committer._thread is None
+    assert len(commits) == 1
+
+    def work(db):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        committer.run(work)
+
+
+def test_add_missing_columns_upgrades_old_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE call_sessions DROP COLUMN tenant_id")
+        connection.exec_driver_sql(
+            "INSERT INTO call_sessions (id, transcript, attempts, llm_failures, status, created_at, updated_at) "
+            "VALUES ('CA1', '', 0, 0, 'completed', '2024-01-01', '2024-01-01')"
+        )
+
+    added = add_missing_columns(engine)
+
+    assert "call_sessions.tenant_id" in added
+    assert "orders.tenant_id" not in added
+    assert add_missing_columns(engine) == []
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT tenant_id FROM call_sessions").fetchall() == [(None,)]
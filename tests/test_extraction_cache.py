@@ -0,0 +1,70 @@
+import asyncio
+
+from app.services import llm_order_extractor
+from app.services.extraction_cache import ExtractionCache, cache_key
+from app.services.menu import build_menu_index, load_menu
+
+INDEX = build_menu_index(load_menu("menu.json"))
+
+RESPONSE = (
+    '{"order": {"items": [{"name": "Cola", "quantity": 2}]}, '
+    '"missing_fields": [], "question": null}'
+)
+
+
+def test_key_normalizes_utterance_and_hashes_state():
+    state = {"items": [{"name": "Cola", "quantity": 1}], "order_type": "takeaway"}
+    reordered = {"order_type": "takeaway", "items": [{"quantity": 1, "name": "Cola"}]}
+    assert cache_key("Yes, that's it!", state, "v1") == cache_key("  yes thats   it", reordered, "v1")
+    assert cache_key("yes thats it", state, "v1") != cache_key("yes thats it", {}, "v1")
+    assert cache_key("yes thats it", state, "v1") != cache_key("yes thats it", state, "v2")
+
+
+def test_lru_eviction_and_ttl():
+    cache = ExtractionCache(max_entries=2, ttl_seconds=60)
+    cache.put(("a", "", "v"), {"order": {}}, "")
+    cache.put(("b", "", "v"), {"order": {}}, "")
+    assert cache.get(("a", "", "v")) is not None
+    cache.put(("c", "", "v"), {"order": {}}, "")
+    assert cache.get(("b", "", "v")) is None
+    assert cache.stats()["entries"] == 2
+
+    expired = ExtractionCache(max_entries=2, ttl_seconds=0)
+    expired.put(("a", "", "v"), {"order": {}}, "")
+    assert expired.get(("a", "", "v")) is None
+
+
+def test_repeated_utterance_skips_llm(monkeypatch):
+    calls = []
+
+    async def fake_call_llm(transcript, index, state):
+        calls.append(transcript)
+        return RESPONSE, {}
+
+    cache = ExtractionCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(llm_order_extractor, "extraction_cache", cache)
+    monkeypatch.setattr(llm_order_extractor, "_call_llm", fake_call_llm)
+
+    first = asyncio.run(llm_order_extractor.extract_or_question("could I get a couple of colas", INDEX))
+    second = asyncio.run(llm_order_extractor.extract_or_question("Could I get a couple of colas?", INDEX))
+
+    assert len(calls) == 1
+    assert (first.source, second.source) == ("llm", "cache")
+    assert second.order == first.order
+    assert first.question and first.question_cacheable
+    assert cache.stats()["hits"] == 1
+
+
+def test_questions_naming_unknown_items_are_not_cacheable(monkeypatch):
+    async def fake_call_llm(transcript, index, state):
+        return (
+            '{"order": {"items": [{"name": "Durian Surprise", "quantity": 1}, {"name": "Cola", "quantity": 1}]}, '
+            '"missing_fields": [], "question": null}'
+        ), {}
+
+    monkeypatch.setattr(llm_order_extractor, "extraction_cache", ExtractionCache(max_entries=10, ttl_seconds=60))
+    monkeypatch.setattr(llm_order_extractor, "_call_llm", fake_call_llm)
+    result = asyncio.run(llm_order_extractor.extract_or_question("a durian surprise and a cola", INDEX))
+
+    assert "Durian Surprise" in result.question
+    assert not result.question_cacheable
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.config import settings
+from app.services import llm_order_extractor
+from app.services.json_stream import IncrementalJSONParser
+from app.services.menu import build_menu_index, load_menu
+
+INDEX = build_menu_index(load_menu("menu.json"))
+
+RESPONSE = (
+    '```json\n{"order": {"items": [{"name": "Cola", "quantity": 2, "special_instructions": "no ice, \\"please\\""}]}, '
+    '"missing_fields": [], "question": null, "notes": "this is never read"}\n```'
+)
+
+
+def test_parser_reads_a_response_split_across_chunks():
+    parser = IncrementalJSONParser()
+    for start in range(0, len(RESPONSE), 5):
+        parser.feed(RESPONSE[start:start + 5])
+
+    assert parser.closed and not parser.failed
+    assert parser.result["order"]["items"][0]["special_instructions"] == 'no ice, "please"'
+    assert parser.result["notes"] == "this is never read"
+
+
+def test_parser_has_keys_before_object_closes():
+    parser = IncrementalJSONParser()
+    parser.feed('{"order": {}, "missing_fields": ["items"], "question": "What would you like?", "no')
+    assert parser.has_keys(("order", "missing_fields", "question"))
+    assert not parser.closed
+
+
+class FakeStream:
+    def __init__(self, text):
+        self.pieces = [text[start:start + 7] for start in range(0, len(text), 7)]
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed > len(self.pieces):
+            raise StopAsyncIteration
+        self.consumed += 1
+        if self.consumed > len(self.pieces):
+            usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30, prompt_tokens_details=None)
+            return SimpleNamespace(usage=usage, choices=[])
+        piece = self.pieces[self.consumed - 1]
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    async def close(self):
+        self.closed = True
+
+
+def _client(stream):
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        assert kwargs["stream_options"] == {"include_usage": True}
+        return stream
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_streaming_extraction_closes_the_stream_once_the_keys_arrive(monkeypatch, caplog):
+    stream = FakeStream(RESPONSE)
+    monkeypatch.setattr(settings, "llm_streaming", True)
+    monkeypatch.setattr(settings, "extraction_cache_enabled", False)
+    monkeypatch.setattr(llm_order_extractor, "get_llm_client", lambda: _client(stream))
+
+    with caplog.at_level("INFO", logger=llm_order_extractor.__name__):
+        result = asyncio.run(llm_order_extractor.extract_or_question("could I get a couple of colas", INDEX))
+
+    assert stream.consumed < len(stream.pieces)
+    assert stream.closed
+    assert "unavailable" in caplog.text and "prompt_tokens=120" not in caplog.text
+    assert result.source == "llm"
+    assert result.order["items"][0]["quantity"] == 2
+    assert result.missing_fields == ["items[0].size"]
+
+
+def test_streaming_logs_usage_when_the_stream_runs_to_the_end(monkeypatch, caplog):
+    stream = FakeStream("Sorry, I can only help with food orders.")
+    monkeypatch.setattr(settings, "llm_streaming", True)
+    monkeypatch.setattr(settings, "extraction_cache_enabled", False)
+    monkeypatch.setattr(llm_order_extractor, "get_llm_client", lambda: _client(stream))
+
+    with caplog.at_level("INFO", logger=llm_order_extractor.__name__):
+        asyncio.run(llm_order_extractor.extract_or_question("do you sell shoes", INDEX))
+
+    assert stream.closed
+    assert "prompt_tokens=120" in caplog.text and "completion_tokens=30" in caplog.text
@@ -0,0 +1,53 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services import llm_client, speech_to_text
+
+
+def test_client_is_reused_and_closed_on_shutdown(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm_client, "_client", None)
+
+    first = llm_client.get_llm_client()
+    assert llm_client.get_llm_client() is first
+    assert first.max_retries == 0
+
+    asyncio.run(llm_client.close_llm_client())
+    assert first.is_closed()
+    assert llm_client._client is None
+    assert llm_client.get_llm_client() is not first
+    asyncio.run(llm_client.close_llm_client())
+
+
+def test_missing_api_key_is_reported(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "")
+    monkeypatch.setattr(llm_client, "_client", None)
+    with pytest.raises(RuntimeError):
+        llm_client.get_llm_client()
+
+
+def test_audio_calls_share_one_client_with_the_configured_base_url(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "openai_base_url", "https://llm.example.test/v1")
+    monkeypatch.setattr(llm_client, "_audio_client", None)
+
+    client = llm_client.get_audio_client()
+    assert llm_client.get_audio_client() is client
+    assert str(client.base_url).startswith("https://llm.example.test/v1")
+
+    calls = []
+    monkeypatch.setattr(
+        client.audio.transcriptions,
+        "create",
+        lambda **kwargs: calls.append(kwargs) or SimpleNamespace(text="two cokes"),
+    )
+    assert speech_to_text._whisper(b"audio", "utterance.wav") == "two cokes"
+    assert speech_to_text._whisper(b"audio", "utterance.wav") == "two cokes"
+    assert len(calls) == 2
+
+    asyncio.run(llm_client.close_llm_client())
+    assert client.is_closed()
+    assert llm_client._audio_client is None
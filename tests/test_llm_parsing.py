@@ -1,4 +1,9 @@
-from app.services.llm_order_extractor import parse_llm_response
+import asyncio
+
+from app.config import settings
+from app.services import llm_order_extractor
+from app.services.llm_order_extractor import apply_order_delta, build_messages, parse_llm_response
+from app.services.menu import build_menu_index, load_menu
 
 
 def test_parse_llm_response_json():
@@ -17,3 +22,65 @@ def test_parse_llm_response_code_fence():
     text = "```json\n{\"order\": {\"items\": []}, \"missing_fields\": [], \"question\": null}\n```"
     parsed = parse_llm_response(text)
     assert parsed.get("order") == {"items": []}
+
+
+def test_prompt_prefix_is_stable_across_turns():
+    index = build_menu_index(load_menu("menu.json"))
+    first = build_messages("two cokes", index, {})
+    second = build_messages("large", index, {"items": [{"name": "Cola"}], "confidence_notes": "x"})
+    assert first[0] == second[0]
+    assert "Margherita Pizza" in first[0]["content"]
+    assert index.version in first[0]["content"]
+    assert "Margherita Pizza" not in second[1]["content"]
+    assert "confidence_notes" not in second[1]["content"]
+    assert second[1]["content"].index("Existing order state") < second[1]["content"].index("Caller said: large")
+
+
+def test_apply_order_delta_edits_items_by_original_index():
+    state = {
+        "order_type": "takeaway",
+        "items": [
+            {"name": "Margherita Pizza", "quantity": 1, "size": "small"},
+            {"name": "Cola", "quantity": 2, "size": "can"},
+            {"name": "Seasoned Fries", "quantity": 1, "size": "large"},
+        ],
+    }
+    changes = [
+        {"op": "remove", "index": 0},
+        {"op": "modify", "index": 1, "fields": {"quantity": 3, "price": 0}},
+        {"op": "add", "item": {"name": "Chocolate Brownie", "quantity": 1}},
+        {"op": "set", "field": "customer_name", "value": "Sam"},
+        {"op": "set", "field": "total", "value": 0},
+        {"op": "remove", "index": 7},
+        "nonsense",
+    ]
+    merged = apply_order_delta(state, changes)
+
+    assert [(item["name"], item["quantity"]) for item in merged["items"]] == [
+        ("Cola", 3),
+        ("Seasoned Fries", 1),
+        ("Chocolate Brownie", 1),
+    ]
+    assert "price" not in merged["items"][0]
+    assert merged["customer_name"] == "Sam"
+    assert "total" not in merged
+    assert state["items"][1]["quantity"] == 2
+
+
+def test_extraction_applies_delta_and_keeps_existing_items(monkeypatch):
+    index = build_menu_index(load_menu("menu.json"))
+    state = {"items": [{"item_id": "cola", "name": "Cola", "quantity": 2, "size": "can"}]}
+
+    async def fake_call_llm(transcript, menu_index, current_state):
+        assert '"index": 0' in build_messages(transcript, menu_index, current_state)[1]["content"]
+        return (
+            '{"changes": [{"op": "add", "item": {"name": "brownie", "quantity": 1}}], '
+            '"missing_fields": [], "question": null}'
+        ), {}
+
+    monkeypatch.setattr(llm_order_extractor, "_call_llm", fake_call_llm)
+    monkeypatch.setattr(settings, "extraction_cache_enabled", False)
+    result = asyncio.run(llm_order_extractor.extract_or_question("and a brownie as well please", index, state))
+
+    assert [item["name"] for item in result.order["items"]] == ["Cola", "Chocolate Brownie"]
+    assert result.missing_fields == ["items[1].size"]
@@ -0,0 +1,39 @@
+import json
+
+from loadtest.run import percentile
+from loadtest.stub_llm import completion_payload, stream_chunks
+
+
+def test_percentile_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_stub_returns_canned_order_for_caller_text():
+    body = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "menu"},
+            {"role": "user", "content": "Existing order state (JSON): {}\nCaller said: what do you have for dessert"},
+        ],
+    }
+    payload = completion_payload(body)
+    content = json.loads(payload["choices"][0]["message"]["content"])
+    assert content["missing_fields"] == ["items"]
+    assert "Cheesecake" in content["question"]
+    assert payload["usage"]["prompt_tokens"] > 0
+
+
+def test_stub_streams_content_in_chunks():
+    body = {
+        "stream": True,
+        "stream_options": {"include_usage": True},
+        "messages": [{"role": "user", "content": "Caller said: what do you have for dessert"}],
+    }
+    chunks = stream_chunks(body)
+    content = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks if chunk["choices"])
+    assert "Cheesecake" in json.loads(content)["question"]
+    assert chunks[-1]["usage"]["completion_tokens"] > 0
@@ -0,0 +1,58 @@
+import asyncio
+
+from app.services.llm_order_extractor import extract_or_question, validate_order_draft
+from app.services.local_parser import parse_locally
+from app.services.menu import build_menu_index, load_menu
+
+INDEX = build_menu_index(load_menu("menu.json"))
+
+
+def test_parse_quantities_sizes_and_items():
+    order = parse_locally("Two large pepperoni pizzas and fries please", INDEX)
+    items = order["items"]
+    assert [(i["item_id"], i["quantity"], i["size"]) for i in items] == [
+        ("pepperoni", 2, "large"),
+        ("fries", 1, None),
+    ]
+
+
+def test_parse_addons_and_trailing_size():
+    order = parse_locally("a margherita medium with olives and extra cheese", INDEX)
+    item = order["items"][0]
+    assert item["size"] == "medium"
+    assert item["addons"] == ["olives", "extra cheese"]
+
+
+def test_bare_size_answer_fills_missing_size():
+    state = {"items": [{"item_id": "fries", "name": "Seasoned Fries", "quantity": 1, "size": None}]}
+    order = parse_locally("large", INDEX, state)
+    assert order["items"][0]["size"] == "large"
+
+
+def test_unknown_words_hand_off_to_llm():
+    assert parse_locally("do you have anything gluten free", INDEX) is None
+    assert parse_locally("medium", INDEX) is None
+    assert parse_locally("two", INDEX) is None
+
+
+def test_extract_or_question_uses_local_path():
+    result = asyncio.run(extract_or_question("two cokes", INDEX))
+    assert result.source == "local"
+    assert result.missing_fields == ["items[0].size"]
+    assert "size" in result.question
+
+
+def test_reply_to_unknown_item_question_replaces_the_unknown_item():
+    state, missing, question = validate_order_draft({"items": [{"name": "Durian Pizza", "quantity": 1}]}, INDEX)
+    assert missing == ["items[0].menu_item"]
+    assert question.startswith("Sorry, we do not have Durian Pizza")
+
+    result = asyncio.run(extract_or_question("large margherita", INDEX, state))
+    assert result.source == "local"
+    assert result.missing_fields == []
+    assert [(i["item_id"], i["size"]) for i in result.order["items"]] == [("margherita", "large")]
+
+
+def test_several_unknown_items_hand_off_to_llm():
+    state = {"items": [{"name": "Durian Pizza", "quantity": 1}, {"name": "Sushi", "quantity": 2}]}
+    assert parse_locally("large margherita", INDEX, state) is None
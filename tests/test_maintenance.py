@@ -0,0 +1,47 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from app.models import CallSession
+from app.services.maintenance import SessionMaintenance
+
+
+def _add(db, session_id, status, updated_at):
+    db.add(
+        CallSession(
+            id=session_id,
+            caller_phone="+15551234567",
+            transcript="one cola",
+            status=status,
+            created_at=updated_at,
+            updated_at=updated_at,
+        )
+    )
+
+
+def test_stale_sessions_are_abandoned_and_old_ones_archived(session_factory, tmp_path):
+    now = datetime(2024, 5, 10, 12, 0)
+    db = session_factory()
+    _add(db, "CA-live", "in_progress", now - timedelta(minutes=5))
+    _add(db, "CA-stale", "in_progress", now - timedelta(hours=3))
+    _add(db, "CA-recent", "completed", now - timedelta(hours=1))
+    _add(db, "CA-old", "completed", now - timedelta(days=2))
+    _add(db, "CA-old-fallback", "fallback", now - timedelta(days=3))
+    db.commit()
+    db.close()
+
+    maintenance = SessionMaintenance(session_factory, archive_dir=str(tmp_path))
+    assert maintenance.run_once(now) == {"abandoned": 1, "archived": 2}
+
+    db = session_factory()
+    remaining = {row.id: row.status for row in db.query(CallSession)}
+    assert remaining == {"CA-live": "in_progress", "CA-stale": "abandoned", "CA-recent": "completed"}
+
+    with gzip.open(tmp_path / "call_sessions-2024-05-08.ndjson.gz", "rt") as handle:
+        records = [json.loads(line) for line in handle]
+    assert [record["id"] for record in records] == ["CA-old"]
+    assert records[0]["transcript"] == "one cola"
+    assert (tmp_path / "call_sessions-2024-05-07.ndjson.gz").exists()
+
+    maintenance.vacuum()
+    assert maintenance.run_once(now) == {"abandoned": 0, "archived": 0}
@@ -0,0 +1,116 @@
+import base64
+import json
+import math
+import time
+from array import array
+
+from fastapi.testclient import TestClient
+
+from app.api import routes_calls, routes_media
+from app.api.routes_calls import Turn
+from app.config import settings
+from app.main import app
+from app.services.audio import EnergyVAD, decode_ulaw, encode_ulaw
+from app.services.session_store import SessionStore
+from app.services.speech_to_text import StubTranscriber
+from app.services.tts import TTSCache
+
+TONE = [int(3000 * math.sin(2 * math.pi * 440 * n / 8000)) for n in range(160)]
+SILENCE = [0] * 160
+
+
+def _frames(tone_ms, silence_ms):
+    return [TONE] * (tone_ms // 20) + [SILENCE] * (silence_ms // 20)
+
+
+def test_ulaw_round_trip_is_close():
+    decoded = decode_ulaw(encode_ulaw(TONE))
+    assert max(abs(a - b) for a, b in zip(decoded, TONE)) < 100
+
+
+def test_vad_emits_utterance_after_trailing_silence():
+    vad = EnergyVAD(threshold=500, silence_ms=200, min_speech_ms=100, max_utterance_ms=5000)
+    results = [vad.feed(array("h", frame)) for frame in _frames(300, 300)]
+    utterances = [result for result in results if result is not None]
+    assert len(utterances) == 1
+    assert len(utterances[0]) >= 160 * 15
+
+    vad = EnergyVAD(threshold=500, silence_ms=200, min_speech_ms=100, max_utterance_ms=5000)
+    assert all(vad.feed(array("h", frame)) is None for frame in _frames(40, 300))
+
+
+def _media(frame):
+    payload = base64.b64encode(encode_ulaw(frame)).decode("ascii")
+    return json.dumps({"event": "media", "media": {"track": "inbound", "payload": payload}})
+
+
+def test_media_stream_drives_extraction_and_speaks_back(session_factory, tmp_path, monkeypatch):
+    store = SessionStore(session_factory)
+    spoken = []
+
+    def fake_synthesize(text, voice, response_format="mp3"):
+        spoken.append(text)
+        return array("h", TONE * 3).tobytes()
+
+    monkeypatch.setattr(settings, "use_openai_tts", True)
+    monkeypatch.setattr(settings, "stream_silence_ms", 200)
+    monkeypatch.setattr(routes_calls, "session_store", store)
+    monkeypatch.setattr(routes_media, "tts_cache", TTSCache(str(tmp_path), synthesize=fake_synthesize))
+    monkeypatch.setattr(routes_media, "get_transcriber", lambda: StubTranscriber(["two cokes", "bottle"]))
+
+    client = TestClient(app)
+    with client.websocket_connect("/twilio/media") as ws:
+        ws.send_text(json.dumps({"event": "connected"}))
+        ws.send_text(json.dumps({
+            "event": "start",
+            "streamSid": "MZ1",
+            "start": {"streamSid": "MZ1", "callSid": "CA-stream", "customParameters": {"from": "+15550001111"}},
+        }))
+        for frame in _frames(300, 300):
+            ws.send_text(_media(frame))
+        messages = [ws.receive_json() for _ in range(2)]
+        assert [m["event"] for m in messages] == ["media", "mark"]
+        assert messages[0]["streamSid"] == "MZ1"
+        ws.send_text(json.dumps({"event": "mark", "mark": messages[1]["mark"]}))
+
+        for frame in _frames(300, 300):
+            ws.send_text(_media(frame))
+        assert ws.receive_json()["event"] == "media"
+        ws.send_text(json.dumps({"event": "stop"}))
+
+    assert "size" in spoken[0]
+    assert spoken[1].startswith("You ordered")
+    session = store.cached("CA-stream")
+    assert session.caller_phone == "+15550001111"
+    assert session.order_state["items"][0]["size"] == "bottle"
+
+
+def test_stream_end_without_recorded_turn_resumes_gather():
+    response = TestClient(app).post("/twilio/stream-end", data={"CallSid": "CA-unknown"})
+    assert response.status_code == 200
+    assert "<Gather" in response.text
+
+
+def test_stream_endings_expire_when_stream_end_never_arrives(monkeypatch):
+    monkeypatch.setattr(routes_media, "stream_endings", {})
+    routes_media.stream_endings["CA-old"] = (
+        Turn("hangup", "Bye"),
+        time.monotonic() - routes_media.STREAM_ENDING_TTL_SECONDS - 1,
+    )
+    routes_media.remember_ending("CA-new", Turn("hangup", "Thanks"))
+    assert list(routes_media.stream_endings) == ["CA-new"]
+
+    response = TestClient(app).post("/twilio/stream-end", data={"CallSid": "CA-new"})
+    assert "Thanks" in response.text and "<Hangup" in response.text
+    assert routes_media.stream_endings == {}
+
+
+def test_voice_webhook_connects_stream_when_enabled(session_factory, monkeypatch):
+    monkeypatch.setattr(routes_calls, "session_store", SessionStore(session_factory))
+    monkeypatch.setattr(settings, "media_streams_enabled", True)
+    monkeypatch.setattr(settings, "base_url", "https://example.test")
+
+    response = TestClient(app).post("/twilio/voice", data={"CallSid": "CA1", "From": "+15550001111"})
+    assert '<Connect action="https://example.test/twilio/stream-end"' in response.text
+    assert '<Stream url="wss://example.test/twilio/media">' in response.text
+    assert '<Parameter name="from" value="+15550001111" />' in response.text
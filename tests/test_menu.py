@@ -1,4 +1,5 @@
-from app.services.menu import all_items, load_menu, validate_menu
+from app.services.menu import all_items, build_menu_index, load_menu, validate_menu
+from app.services.pricing import price_items
 
 
 def test_menu_loads():
@@ -9,3 +10,19 @@ def test_menu_loads():
 def test_menu_validation():
     valid_menu = {"categories": [{"name": "Test", "items": [{"id": "x", "name": "Item"}]}]}
     validate_menu(valid_menu)
+
+
+def test_menu_index_resolves_names_aliases_and_ids():
+    index = build_menu_index(load_menu("menu.json"))
+    assert index.resolve("Margherita Pizza")["id"] == "margherita"
+    assert index.resolve("coke")["id"] == "cola"
+    assert index.resolve(item_id="fries")["name"] == "Seasoned Fries"
+    assert index.match_variant("pepperoni", "Large") == "large"
+    assert index.match_addon("fries", "Cheese Sauce") == "cheese sauce"
+    assert index.resolve("sushi") is None
+
+
+def test_price_items_accepts_index():
+    index = build_menu_index(load_menu("menu.json"))
+    totals = price_items([{"name": "chips", "quantity": 2}], index)
+    assert totals["subtotal"] == 7.0
@@ -0,0 +1,33 @@
+from app.services.llm_order_extractor import closest_menu_items, validate_order_draft
+from app.services.menu import build_menu_index, load_menu
+from app.services.menu_matcher import phonetic_key
+
+INDEX = build_menu_index(load_menu("menu.json"))
+
+
+def test_phonetic_key_ignores_spacing_and_spelling():
+    assert phonetic_key("marg rita") == phonetic_key("Margherita")
+    assert phonetic_key("cheese cake") == phonetic_key("cheesecake")
+
+
+def test_fuzzy_resolve_asr_errors():
+    assert INDEX.fuzzy_resolve("pepper only pizza")["id"] == "pepperoni"
+    assert INDEX.fuzzy_resolve("marg rita")["id"] == "margherita"
+    assert INDEX.fuzzy_resolve("garlic bred")["id"] == "garlic_bread"
+    assert INDEX.fuzzy_resolve("sushi") is None
+    assert INDEX.fuzzy_resolve("pizza") is None
+
+
+def test_validate_canonicalizes_misheard_item():
+    order, missing, _ = validate_order_draft(
+        {"items": [{"name": "pepper only pizza", "quantity": 1, "size": "large"}]},
+        INDEX,
+    )
+    assert missing == []
+    assert order["items"][0]["name"] == "Pepperoni Pizza"
+    assert order["items"][0]["item_id"] == "pepperoni"
+
+
+def test_closest_menu_items_suggests_alternatives():
+    assert closest_menu_items("pizza", INDEX)[0].endswith("Pizza")
+    assert closest_menu_items("water", INDEX) == []
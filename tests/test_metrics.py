@@ -0,0 +1,12 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.metrics import timed
+
+
+def test_stage_timings_exposed_on_metrics_endpoint():
+    with timed("unit_test_stage"):
+        pass
+    body = TestClient(app).get("/metrics").text
+    assert 'takeaway_stage_seconds_count{stage="unit_test_stage"} 1.0' in body
+    assert "takeaway_fallbacks_total" in body
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.order_events import OrderEventBroker, format_sse
+
+
+def _order(status: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id="order-1",
+        timestamp=datetime(2024, 1, 1, 12, 0),
+        customer_name=None,
+        caller_phone="+15551234567",
+        order_type="takeaway",
+        total=4.0,
+        status=status,
+        tenant_id=None,
+    )
+
+
+def test_publish_from_worker_thread_reaches_subscriber():
+    broker = OrderEventBroker()
+
+    async def scenario():
+        async with broker.subscribe() as queue:
+            thread = threading.Thread(target=broker.publish_order, args=(_order("printed"),))
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(queue.get(), timeout=1)
+
+    event, payload = asyncio.run(scenario())
+    assert event == "order"
+    assert payload["order_id"] == "order-1"
+    assert payload["status"] == "printed"
+    assert format_sse(event, payload).startswith("event: order\ndata: {")
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    OrderEventBroker().publish_order(_order("confirmed"))
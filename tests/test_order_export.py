@@ -0,0 +1,81 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+from app.models import Order
+from app.services import order_export
+
+
+def _seed(factory, count=5):
+    db = factory()
+    start = datetime(2024, 1, 1, 12, 0)
+    for n in range(count):
+        db.add(
+            Order(
+                id=f"order-{n}",
+                timestamp=start + timedelta(days=n),
+                caller_phone="+15550000000",
+                items=[{"item_id": "pizza", "name": "Pizza", "quantity": 2, "size": "large", "addons": ["olives"]}],
+                total=10.0 + n,
+                status="printed",
+                raw_transcript="secret transcript",
+            )
+        )
+    db.commit()
+    db.close()
+
+
+def test_csv_export_streams_filtered_orders_in_batches(session_factory, api_client, monkeypatch):
+    monkeypatch.setattr(order_export, "EXPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(order_export, "EXPORT_FLUSH_ROWS", 2)
+    _seed(session_factory)
+    response = api_client.get("/api/orders/export", params={"since": "2024-01-02T00:00:00", "until": "2024-01-05T00:00:00"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["order_id"] for row in rows] == ["order-1", "order-2", "order-3"]
+    assert rows[0]["items"] == "2x Pizza (large) + olives"
+    assert rows[0]["total"] == "11.0"
+    assert "secret transcript" not in response.text
+
+
+def test_export_bounds_with_a_timezone_are_compared_in_utc(session_factory, api_client):
+    _seed(session_factory)
+    response = api_client.get(
+        "/api/orders/export",
+        params={"since": "2024-01-02T14:00:00+02:00", "until": "2024-01-04T07:00:00-05:00"},
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["order_id"] for row in rows] == ["order-1", "order-2"]
+
+
+def test_gzipped_ndjson_export(session_factory, api_client):
+    _seed(session_factory, count=3)
+    response = api_client.get("/api/orders/export", params={"format": "ndjson", "gzip": "true"})
+
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="orders.ndjson.gz"' in response.headers["content-disposition"]
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["order_id"] for record in records] == ["order-0", "order-1", "order-2"]
+    assert records[0]["items"][0]["item_id"] == "pizza"
+
+
+def test_items_text_tolerates_irregular_items():
+    items = [
+        {"name": "Pizza", "quantity": None, "addons": [{"name": "olives"}], "modifiers": [3]},
+        {"name": "Cola", "quantity": "two"},
+        {"name": "Chips", "quantity": "2"},
+    ]
+    assert order_export.items_text(items) == "0x Pizza + 3, {'name': 'olives'}; 0x Cola; 2x Chips"
+
+
+def test_export_requires_auth_and_valid_format(session_factory, api_client):
+    _seed(session_factory, count=1)
+    unauthorized = api_client.get("/api/orders/export", headers={"X-Auth-Token": "wrong"})
+    invalid = api_client.get("/api/orders/export", params={"format": "xlsx"})
+    assert unauthorized.status_code == 401
+    assert invalid.status_code == 422
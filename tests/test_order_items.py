@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from datetime import datetime
+
+from app.api.routes_calls import _save_order
+from app.models import Order, OrderItem
+from app.schemas import Order as OrderSchema
+from app.services.order_items import OrderItemBackfill, backfill_order_items
+
+PIZZA = {"item_id": "margherita", "name": "Margherita Pizza", "quantity": 2, "size": "large", "addons": ["olives"]}
+COLA = {"item_id": "cola", "name": "Cola", "quantity": 1}
+
+
+def _legacy_order(order_id, items):
+    return Order(
+        id=order_id,
+        timestamp=datetime(2024, 1, 1, 12, 0),
+        caller_phone="+15550000000",
+        order_type="takeaway",
+        items=items,
+        status="printed",
+    )
+
+
+def test_saved_orders_write_item_rows(session_factory):
+    db = session_factory()
+    _save_order(db, OrderSchema(
+        order_id="new",
+        timestamp=datetime(2024, 1, 2, 19, 0),
+        caller_phone="+15550000000",
+        items=[PIZZA, COLA],
+        status="confirmed",
+        tenant_id="pizza",
+    ))
+    db.commit()
+
+    rows = db.query(OrderItem).order_by(OrderItem.position).all()
+    assert [(row.position, row.item_id, row.quantity, row.size) for row in rows] == [
+        (0, "margherita", 2, "large"),
+        (1, "cola", 1, None),
+    ]
+    assert rows[0].addons == ["olives"]
+    assert {row.tenant_id for row in rows} == {"pizza"}
+    assert {row.timestamp for row in rows} == {datetime(2024, 1, 2, 19, 0)}
+    db.close()
+
+
+def test_backfill_fills_only_orders_without_item_rows(session_factory):
+    db = session_factory()
+    db.add_all([_legacy_order("a", [PIZZA]), _legacy_order("b", [PIZZA, COLA]), _legacy_order("c", [COLA])])
+    db.commit()
+    db.close()
+
+    stopped = threading.Event()
+    stopped.set()
+    assert backfill_order_items(session_factory, stop=stopped) == 0
+    assert backfill_order_items(session_factory, batch_size=2) == 3
+    assert backfill_order_items(session_factory) == 0
+
+    db = session_factory()
+    assert db.query(OrderItem).count() == 4
+    db.close()
+
+
+def test_background_backfill_fills_missing_rows(session_factory):
+    db = session_factory()
+    db.add_all([_legacy_order("a", [PIZZA]), _legacy_order("b", [COLA])])
+    db.commit()
+    db.close()
+
+    async def run():
+        backfill = OrderItemBackfill(session_factory)
+        await backfill.start()
+        await backfill._task
+        await backfill.stop()
+
+    asyncio.run(run())
+    db = session_factory()
+    assert db.query(OrderItem).count() == 2
+    db.close()
+
+
+def test_orders_can_be_filtered_by_item(session_factory, api_client):
+    db = session_factory()
+    db.add_all([_legacy_order("a", [PIZZA]), _legacy_order("b", [PIZZA, COLA]), _legacy_order("c", [COLA])])
+    db.commit()
+    db.close()
+    backfill_order_items(session_factory)
+
+    page = api_client.get("/api/orders", params={"item_id": "cola"}).json()
+    assert [item["order_id"] for item in page["items"]] == ["c", "b"]
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from app.models import Order
+from app.services.order_items import backfill_order_items
+
+
+def _seed(factory):
+    db = factory()
+    start = datetime(2024, 1, 1, 12, 0)
+    for n in range(5):
+        db.add(
+            Order(
+                id=f"order-{n}",
+                timestamp=start + timedelta(minutes=n // 2),
+                caller_phone="+1555000000" + str(n % 2),
+                items=[{"item_id": "cola", "name": "Cola", "quantity": 1}],
+                status="printed" if n % 2 else "confirmed",
+                raw_transcript="secret transcript",
+            )
+        )
+    db.commit()
+    db.close()
+
+
+def test_keyset_pagination_walks_all_orders_once(session_factory, api_client):
+    _seed(session_factory)
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = api_client.get("/api/orders", params=params).json()
+        seen.extend(item["order_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ["order-4", "order-3", "order-2", "order-1", "order-0"]
+
+
+def test_filters_and_summary_projection(session_factory, api_client):
+    _seed(session_factory)
+    page = api_client.get(
+        "/api/orders",
+        params={"status": "printed", "caller_phone": "+15550000001", "since": "2024-01-01T12:01:00"},
+    ).json()
+    bad_cursor = api_client.get("/api/orders", params={"cursor": "not-a-cursor"})
+    assert [item["order_id"] for item in page["items"]] == ["order-3"]
+    assert "raw_transcript" not in page["items"][0]
+    assert bad_cursor.status_code == 400
+
+
+def test_bounds_with_a_timezone_are_compared_in_utc(session_factory, api_client):
+    _seed(session_factory)
+    backfill_order_items(session_factory)
+    bounds = {"since": "2024-01-01T14:01:00+02:00", "until": "2024-01-01T07:02:00-05:00"}
+    page = api_client.get("/api/orders", params=bounds).json()
+    by_item = api_client.get("/api/orders", params={**bounds, "item_id": "cola"}).json()
+    assert [item["order_id"] for item in page["items"]] == ["order-3", "order-2"]
+    assert [item["order_id"] for item in by_item["items"]] == ["order-3", "order-2"]
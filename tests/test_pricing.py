@@ -0,0 +1,120 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import Order
+from app.services.menu import MenuError, build_menu_index, load_menu
+from app.services.analytics import record_order, sales_summary
+from app.services.pricing import compile_prices, price_table, to_cents
+from app.services.repricing import reprice_orders
+
+
+def _menu(**extra):
+    return {
+        "tax_rate": 0.2,
+        "categories": [
+            {
+                "id": "food",
+                "name": "Food",
+                "items": [
+                    {
+                        "id": "pizza",
+                        "name": "Pizza",
+                        "aliases": ["pie"],
+                        "price": 10.0,
+                        "variants": ["small", "large"],
+                        "variant_prices": {"Large": 13.5},
+                        "addons": ["olives"],
+                        "addon_prices": {"olives": 0.1},
+                    },
+                ],
+            },
+            {
+                "id": "drinks",
+                "name": "Drinks",
+                "tax_rate": 0.05,
+                "items": [{"id": "cola", "name": "Cola", "price": 0.1}],
+            },
+        ],
+        **extra,
+    }
+
+
+def test_to_cents_rounds_half_up_without_float_drift():
+    assert to_cents(0.1) == 10
+    assert to_cents("2.675") == 268
+    assert to_cents(None) is None
+    assert to_cents("free") is None
+
+
+def test_variant_and_addon_prices_with_per_category_tax():
+    table = price_table(build_menu_index(_menu()))
+    totals = table.price([
+        {"item_id": "pizza", "name": "Pizza", "quantity": 2, "size": "large", "addons": ["olives"]},
+        {"item_id": "pizza", "name": "Pizza", "quantity": 1, "size": "small"},
+        {"item_id": "cola", "name": "Cola", "quantity": 3},
+    ])
+
+    assert totals.subtotal == 2 * 1360 + 1000 + 30
+    assert totals.tax == 744 + 2
+    assert totals.total == totals.subtotal + totals.tax
+    assert totals.as_dict()["subtotal"] == 37.5
+
+
+def test_items_without_ids_fall_back_to_names_and_aliases():
+    table = compile_prices(build_menu_index(_menu()))
+    totals = table.price([{"name": "pie", "quantity": 1}, {"name": "sushi", "quantity": 4}])
+    assert totals.subtotal == 1000
+    assert table.price([{"name": "sushi", "quantity": 1}]).total is None
+
+
+def test_price_table_is_compiled_once_per_index():
+    index = build_menu_index(load_menu("menu.json"))
+    assert price_table(index) is price_table(index)
+    totals = price_table(index).price([{"item_id": "margherita", "quantity": 1, "size": "large"}])
+    assert totals.subtotal == 1250
+
+
+def test_invalid_prices_are_rejected():
+    menu = _menu()
+    menu["categories"][0]["items"][0]["addon_prices"] = {"olives": "lots"}
+    with pytest.raises(MenuError):
+        compile_prices(build_menu_index(menu))
+
+
+def test_reprice_orders_updates_stored_totals_and_rollups(session_factory):
+    items = [{"item_id": "pizza", "name": "Pizza", "quantity": 1, "size": "large"}]
+    db = session_factory()
+    for order_id, tenant_id in [("a", None), ("b", "default"), ("c", "other")]:
+        order = Order(
+            id=order_id,
+            timestamp=datetime(2024, 1, 1),
+            caller_phone="+1555",
+            order_type="takeaway",
+            items=items,
+            subtotal=10.0,
+            tax=2.0,
+            total=12.0,
+            status="printed",
+            tenant_id=tenant_id,
+        )
+        db.add(order)
+        record_order(db, order)
+    db.commit()
+    db.close()
+
+    index = build_menu_index(_menu())
+    preview = reprice_orders(session_factory, index, tenant_ids=["default", None], dry_run=True, batch_size=1)
+    assert preview == {"scanned": 2, "changed": 2}
+
+    result = reprice_orders(session_factory, index, tenant_ids=["default", None], batch_size=1)
+    assert result == {"scanned": 2, "changed": 2}
+    db = session_factory()
+    assert [(o.id, o.total) for o in db.query(Order).order_by(Order.id)] == [
+        ("a", 16.2),
+        ("b", 16.2),
+        ("c", 12.0),
+    ]
+    assert sales_summary(db, "day", datetime(2024, 1, 1), tenant_id="default").revenue == 32.4
+    assert sales_summary(db, "day", datetime(2024, 1, 1), tenant_id="other").revenue == 12.0
+    db.close()
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from app.config import settings
+from app.models import Order, PrintJob
+from app.schemas import Order as OrderSchema
+from app.schemas import OrderItem
+from app.services import print_outbox
+from app.services.print_outbox import PrintWorker, enqueue_print_job
+
+
+def _order() -> OrderSchema:
+    return OrderSchema(
+        order_id="order-1",
+        timestamp=datetime(2024, 1, 1, 12, 0),
+        caller_phone="+15551234567",
+        items=[OrderItem(item_id="cola", name="Cola", quantity=1, size="can")],
+        status="confirmed",
+    )
+
+
+def _seed(factory):
+    db = factory()
+    order = _order()
+    db.add(
+        Order(
+            id=order.order_id,
+            timestamp=order.timestamp,
+            caller_phone=order.caller_phone,
+            items=[item.model_dump() for item in order.items],
+            status=order.status,
+        )
+    )
+    db.commit()
+    enqueue_print_job(db, order)
+    db.close()
+
+
+def test_worker_prints_and_marks_order(session_factory, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _seed(session_factory)
+
+    assert PrintWorker(session_factory).drain_once() == 1
+
+    db = session_factory()
+    assert db.query(PrintJob).one().status == "done"
+    assert db.query(Order).one().status == "printed"
+    assert (tmp_path / "data" / "prints" / "order_order-1.txt").exists()
+
+
+def test_worker_retries_then_fails(session_factory, monkeypatch):
+    _seed(session_factory)
+    monkeypatch.setattr(settings, "print_max_attempts", 2)
+    monkeypatch.setattr(settings, "print_retry_base_seconds", 0)
+
+    def broken(order):
+        raise OSError("printer offline")
+
+    monkeypatch.setattr(print_outbox, "print_order", broken)
+    worker = PrintWorker(session_factory)
+
+    worker.drain_once()
+    db = session_factory()
+    job = db.query(PrintJob).one()
+    assert (job.status, job.attempts) == ("pending", 1)
+    db.close()
+
+    worker.drain_once()
+    db = session_factory()
+    job = db.query(PrintJob).one()
+    assert (job.status, job.attempts, job.last_error) == ("failed", 2, "printer offline")
+    assert db.query(Order).one().status == "print_failed"
+
+
+def test_recover_requeues_interrupted_jobs(session_factory):
+    _seed(session_factory)
+    db = session_factory()
+    db.query(PrintJob).update({"status": "printing"})
+    db.commit()
+    db.close()
+
+    assert PrintWorker(session_factory).recover() == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.printer_escpos import PrinterConnection, PrinterError
+
+
+class FakePrinter:
+    instances = []
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.tickets = []
+        self.opened = 0
+        self.closed = False
+        self._device = True
+        FakePrinter.instances.append(self)
+
+    def open(self):
+        self.opened += 1
+
+    def text(self, ticket):
+        if self.fail_on is not None and len(self.tickets) == self.fail_on:
+            raise OSError("broken pipe")
+        self.tickets.append(ticket)
+
+    def cut(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_is_reused_across_batches():
+    FakePrinter.instances = []
+    connection = PrinterConnection("fake", FakePrinter)
+    connection.send(["a", "b"])
+    connection.send(["c"])
+    assert len(FakePrinter.instances) == 1
+    assert FakePrinter.instances[0].tickets == ["a\n", "b\n", "c\n"]
+
+
+def test_reconnects_and_resumes_after_write_failure():
+    FakePrinter.instances = []
+    factories = iter([lambda: FakePrinter(fail_on=1), FakePrinter])
+    connection = PrinterConnection("fake", lambda: next(factories)())
+    connection.send(["a", "b", "c"])
+    first, second = FakePrinter.instances
+    assert first.closed
+    assert first.tickets == ["a\n"]
+    assert second.tickets == ["b\n", "c\n"]
+
+
+def test_raises_after_reconnect_fails():
+    connection = PrinterConnection("fake", lambda: FakePrinter(fail_on=0))
+    with pytest.raises(PrinterError):
+        connection.send(["a"])
@@ -0,0 +1,37 @@
+from app.models import CallSession
+from app.services.session_store import SessionStore
+
+
+def test_turns_stay_in_memory_until_flush(session_factory):
+    store = SessionStore(session_factory)
+    session = store.get_or_create("CA1", "+15551234567")
+    session.attempts += 1
+    session.order_state = {"items": [{"name": "Cola", "quantity": 1}]}
+    store.save(session)
+
+    assert store.get_or_create("CA1") is session
+    assert session_factory().query(CallSession).count() == 0
+
+    assert store.flush() == 1
+    row = session_factory().query(CallSession).one()
+    assert (row.caller_phone, row.attempts) == ("+15551234567", 1)
+    assert row.order_state["items"][0]["name"] == "Cola"
+    assert store.flush() == 0
+
+
+def test_cache_miss_loads_from_database_and_ended_calls_are_evicted(session_factory):
+    first = SessionStore(session_factory)
+    session = first.get_or_create("CA2", "+1")
+    session.transcript = "two cokes"
+    first.save(session)
+    first.flush()
+
+    second = SessionStore(session_factory)
+    loaded = second.get_or_create("CA2")
+    assert loaded.transcript == "two cokes"
+
+    loaded.status = "completed"
+    second.finish(loaded)
+    second.flush()
+    assert second.cached("CA2") is None
+    assert session_factory().query(CallSession).one().status == "completed"
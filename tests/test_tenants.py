@@ -0,0 +1,130 @@
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes_calls, routes_menu
+from app.config import settings
+from app.main import app
+from app.services.menu import MenuError
+from app.services.session_store import SessionStore
+from app.services.tenants import DEFAULT_TENANT_ID, TenantError, TenantRegistry, load_tenants
+
+
+def _write_tenants(tmp_path, entries):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps({"tenants": entries}))
+    return str(path)
+
+
+def test_numbers_resolve_to_tenants_and_unknown_numbers_use_default(tmp_path):
+    path = _write_tenants(tmp_path, [
+        {"id": "pizza", "name": "Pizza Place", "menu_path": "menu.json", "numbers": ["+1 (555) 000-1111"]},
+        {"id": "burgers", "name": "Burger Bar", "menu_path": "menu.json", "numbers": ["+15550002222"]},
+    ])
+    registry = TenantRegistry(load_tenants(path))
+
+    assert registry.resolve("+15550001111").name == "Pizza Place"
+    assert registry.resolve("+15550002222").id == "burgers"
+    assert registry.resolve("+15559999999").id == DEFAULT_TENANT_ID
+    assert registry.resolve(None).id == DEFAULT_TENANT_ID
+
+
+def test_duplicate_numbers_are_rejected(tmp_path):
+    path = _write_tenants(tmp_path, [
+        {"id": "a", "menu_path": "menu.json", "numbers": ["+15550001111"]},
+        {"id": "b", "menu_path": "menu.json", "numbers": ["15550001111"]},
+    ])
+    with pytest.raises(TenantError):
+        load_tenants(path)
+
+
+def test_menus_load_lazily_into_a_bounded_cache(tmp_path):
+    path = _write_tenants(tmp_path, [
+        {"id": "a", "menu_path": "menu.json"},
+        {"id": "b", "menu_path": "menu.json"},
+        {"id": "broken", "menu_path": str(tmp_path / "missing.json")},
+    ])
+    registry = TenantRegistry(load_tenants(path), cache_size=2)
+    assert registry.cached_tenant_ids() == []
+
+    first = registry.menu_index(registry.get("a"))
+    assert registry.menu_index(registry.get("a")) is first
+    registry.menu_index(registry.get("b"))
+    registry.menu_index(registry.default)
+    assert registry.cached_tenant_ids() == ["b", DEFAULT_TENANT_ID]
+    assert registry.menu_index(registry.get("broken")) is None
+
+
+def test_calls_are_tagged_with_the_dialled_tenant(session_factory, tmp_path, monkeypatch):
+    store = SessionStore(session_factory)
+    path = _write_tenants(tmp_path, [
+        {"id": "pizza", "name": "Pizza Place", "menu_path": "menu.json", "numbers": ["+15550001111"]},
+    ])
+    monkeypatch.setattr(routes_calls, "session_store", store)
+    monkeypatch.setattr(routes_calls, "tenant_registry", TenantRegistry(load_tenants(path)))
+
+    client = TestClient(app)
+    response = client.post("/twilio/voice", data={"CallSid": "CA1", "From": "+15557654321", "To": "+15550001111"})
+    assert "Thanks for calling Pizza Place" in response.text
+
+    response = client.post("/twilio/process", data={"CallSid": "CA1", "SpeechResult": "two cokes"})
+    assert "size" in response.text
+    assert store.cached("CA1").tenant_id == "pizza"
+    assert store.cached("CA1").menu_version is not None
+
+
+def test_registry_defaults_to_single_menu():
+    registry = TenantRegistry()
+    assert [tenant.id for tenant in registry.tenants()] == [DEFAULT_TENANT_ID]
+    assert registry.default.menu_path == settings.menu_path
+
+
+def _menu_copy(tmp_path, price):
+    menu = json.loads(open("menu.json").read())
+    menu["categories"][0]["items"][0]["price"] = price
+    path = tmp_path / "menu.json"
+    path.write_text(json.dumps(menu))
+    return path, menu
+
+
+def test_reload_swaps_version_and_keeps_pinned_versions(tmp_path):
+    path, menu = _menu_copy(tmp_path, 9.0)
+    registry = TenantRegistry(load_tenants(_write_tenants(tmp_path, [{"id": "a", "menu_path": str(path)}])))
+    tenant = registry.get("a")
+    old = registry.menu_index(tenant)
+    assert registry.reload_changed() == []
+
+    _menu_copy(tmp_path, 10.0)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    assert registry.reload_changed() == ["a"]
+    new = registry.menu_index(tenant)
+    assert new.version != old.version
+    assert "prompt_prefix" in new.derived
+    assert registry.menu_index(tenant, old.version) is old
+
+    path.write_text("{not json")
+    with pytest.raises(MenuError):
+        registry.reload(tenant)
+    assert registry.menu_index(tenant) is new
+
+
+def test_reload_endpoint_reports_versions(tmp_path, monkeypatch):
+    path, _ = _menu_copy(tmp_path, 9.0)
+    registry = TenantRegistry(load_tenants(_write_tenants(tmp_path, [{"id": "a", "menu_path": str(path)}])))
+    monkeypatch.setattr(routes_menu, "tenant_registry", registry)
+    client = TestClient(app)
+    headers = {"X-Auth-Token": settings.dashboard_password}
+
+    first = client.post("/api/menu/reload?tenant_id=a", headers=headers).json()
+    assert first["previous_version"] is None
+    _menu_copy(tmp_path, 12.5)
+    second = client.post("/api/menu/reload?tenant_id=a", headers=headers).json()
+    assert second["previous_version"] == first["version"] != second["version"]
+    assert client.get("/api/menu/versions", headers=headers).json() == {"a": second["version"]}
+
+    path.write_text('{"categories": "nope"}')
+    assert client.post("/api/menu/reload?tenant_id=a", headers=headers).status_code == 422
+    assert client.post("/api/menu/reload?tenant_id=zzz", headers=headers).status_code == 404
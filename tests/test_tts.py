@@ -0,0 +1,84 @@
+import asyncio
+
+from app.api import routes_calls
+from app.config import settings
+from app.services import telephony_twilio
+from app.services.llm_order_extractor import ExtractionResult
+from app.services.menu import build_menu_index, load_menu
+from app.services.session_store import LiveSession, SessionStore
+from app.services.tts import TTSCache, audio_key
+
+
+def test_key_depends_on_text_voice_and_model():
+    assert audio_key("Hello", "alloy", "tts-1") == audio_key("Hello", "alloy", "tts-1")
+    assert audio_key("Hello", "alloy", "tts-1") != audio_key("Hello", "nova", "tts-1")
+    assert audio_key("Hello", "alloy", "tts-1") != audio_key("Hello", "alloy", "tts-2")
+
+
+def test_cached_prompts_play_and_misses_fall_back_to_say(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_synthesize(text, voice, response_format="mp3"):
+        calls.append((text, voice))
+        return b"ID3audio"
+
+    cache = TTSCache(str(tmp_path), synthesize=fake_synthesize)
+    monkeypatch.setattr(settings, "use_openai_tts", True)
+    monkeypatch.setattr(settings, "base_url", "https://example.test")
+    monkeypatch.setattr(telephony_twilio, "tts_cache", cache)
+
+    url = cache.render("Please say yes or no.")
+    assert url.startswith("https://example.test/tts/") and url.endswith(".mp3")
+    assert cache.render("Please say yes or no.") == url
+    assert len(calls) == 1
+    assert (tmp_path / url.rsplit("/", 1)[1]).read_bytes() == b"ID3audio"
+
+    twiml = telephony_twilio.gather_speech("https://example.test/twilio/confirm", "Please say yes or no.")
+    assert f"<Play>{url}</Play>" in twiml
+
+    twiml = telephony_twilio.say_and_hangup("Something new")
+    assert "<Say" in twiml and "Something new" in twiml
+    cache.close()
+
+
+def test_disabled_cache_always_says(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "use_openai_tts", False)
+    cache = TTSCache(str(tmp_path), synthesize=lambda text, voice, response_format="mp3": b"audio")
+    assert cache.audio_url("Hello") is None
+    cache.render_later(["Hello"])
+    assert not list(tmp_path.iterdir())
+
+
+def test_cache_evicts_least_recently_used_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "use_openai_tts", True)
+    monkeypatch.setattr(settings, "tts_cache_max_files", 2)
+    cache = TTSCache(str(tmp_path), synthesize=lambda text, voice, response_format="mp3": b"audio")
+
+    cache.render("one")
+    cache.render("two")
+    assert cache.audio_url("one", render_missing=False)
+    cache.render("three")
+
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cache.audio_url("one", render_missing=False)
+    assert cache.audio_url("two", render_missing=False) is None
+    assert cache.audio_url("three", render_missing=False)
+
+
+def test_llm_questions_are_not_cached(session_factory, monkeypatch):
+    monkeypatch.setattr(routes_calls, "session_store", SessionStore(session_factory))
+
+    async def fake_extract(speech, menu_index, order_state):
+        return ExtractionResult(
+            order={"items": []},
+            missing_fields=["items"],
+            question="Would you like a drink with the durian?",
+            raw_response="",
+            question_cacheable=False,
+        )
+
+    monkeypatch.setattr(routes_calls, "extract_or_question", fake_extract)
+    index = build_menu_index(load_menu("menu.json"))
+    turn = asyncio.run(routes_calls.process_speech(LiveSession(id="CA1"), "durian please", index))
+    assert turn.prompt == "Would you like a drink with the durian?"
+    assert turn.cacheable is False